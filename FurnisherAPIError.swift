@@ -10,6 +10,7 @@ enum FurnisherAPIError: LocalizedError {
     case decodingError(String)
     case serverError(Int, String)
     case networkError(Error)
+    case jobTimedOut
 
     var errorDescription: String? {
         switch self {
@@ -25,6 +26,8 @@ enum FurnisherAPIError: LocalizedError {
             return "Server error (\(code)): \(message)"
         case .networkError(let error):
             return "Network error: \(error.localizedDescription)"
+        case .jobTimedOut:
+            return "Design generation took too long"
         }
     }
 }
@@ -36,6 +39,10 @@ class FurnisherAPI {
     // backend url
     private let baseURL = "http://136.116.236.142:5000"
 
+    // The server runs the pipeline in the background; poll its status until it finishes
+    private let pollInterval: UInt64 = 2_000_000_000  // 2 seconds, in nanoseconds
+    private let jobTimeout: TimeInterval = 900  // 15 minutes
+
     private init() {}
 
     // MARK: - Send Room Scan (Simplified for name + USDZ only)
@@ -86,6 +93,54 @@ class FurnisherAPI {
         return try await executeRequest(request)
     }
 
+    // MARK: - Poll Design Job
+    private func waitForDesignJob(statusPath: String) async throws -> SimplifiedResponse {
+        guard let url = URL(string: constructFullURL(statusPath)) else {
+            throw FurnisherAPIError.invalidURL
+        }
+
+        let deadline = Date().addingTimeInterval(jobTimeout)
+        while Date() < deadline {
+            try await Task.sleep(nanoseconds: pollInterval)
+
+            let (data, response) = try await URLSession.shared.data(from: url)
+            guard let httpResponse = response as? HTTPURLResponse else {
+                throw FurnisherAPIError.invalidResponse
+            }
+            guard httpResponse.statusCode == 200 else {
+                let errorMessage = String(data: data, encoding: .utf8) ?? "Unknown error"
+                throw FurnisherAPIError.serverError(httpResponse.statusCode, errorMessage)
+            }
+
+            let status: DesignJobStatusResponse
+            do {
+                status = try JSONDecoder().decode(DesignJobStatusResponse.self, from: data)
+            } catch {
+                print("❌ Decoding error: \(error)")
+                throw FurnisherAPIError.decodingError(error.localizedDescription)
+            }
+
+            guard let job = status.job else {
+                throw FurnisherAPIError.invalidResponse
+            }
+            print("⏳ Design job: \(job.state) (\(job.stage ?? "-"))")
+
+            switch job.state {
+            case "complete":
+                guard let result = job.result else {
+                    throw FurnisherAPIError.invalidResponse
+                }
+                return result
+            case "failed":
+                throw FurnisherAPIError.serverError(500, job.error ?? "Design generation failed")
+            default:
+                continue
+            }
+        }
+
+        throw FurnisherAPIError.jobTimedOut
+    }
+
     // MARK: - Execute Request
     private func executeRequest(_ request: URLRequest) async throws -> SimplifiedResponse {
         do {
@@ -97,7 +152,7 @@ class FurnisherAPI {
 
             print("📥 Response status: \(httpResponse.statusCode)")
 
-            guard httpResponse.statusCode == 200 else {
+            guard httpResponse.statusCode == 200 || httpResponse.statusCode == 202 else {
                 let errorMessage = String(data: data, encoding: .utf8) ?? "Unknown error"
                 print("❌ Server error: \(errorMessage)")
                 throw FurnisherAPIError.serverError(httpResponse.statusCode, errorMessage)
@@ -111,11 +166,24 @@ class FurnisherAPI {
             let decoder = JSONDecoder()
             let serverResponse: SimplifiedResponse
 
-            do {
-                serverResponse = try decoder.decode(SimplifiedResponse.self, from: data)
-            } catch {
-                print("❌ Decoding error: \(error)")
-                throw FurnisherAPIError.decodingError(error.localizedDescription)
+            if httpResponse.statusCode == 202 {
+                // Job accepted: the design arrives as the job result on the status endpoint
+                let accepted: DesignJobAcceptedResponse
+                do {
+                    accepted = try decoder.decode(DesignJobAcceptedResponse.self, from: data)
+                } catch {
+                    print("❌ Decoding error: \(error)")
+                    throw FurnisherAPIError.decodingError(error.localizedDescription)
+                }
+                print("🕒 Design job queued: \(accepted.scanId)")
+                serverResponse = try await waitForDesignJob(statusPath: accepted.statusUrl)
+            } else {
+                do {
+                    serverResponse = try decoder.decode(SimplifiedResponse.self, from: data)
+                } catch {
+                    print("❌ Decoding error: \(error)")
+                    throw FurnisherAPIError.decodingError(error.localizedDescription)
+                }
             }
 
             print("✅ Decoded response:")
@@ -155,6 +223,30 @@ struct SimplifiedResponse: Codable {
     }
 }
 
+// MARK: - Design Job Models
+struct DesignJobAcceptedResponse: Codable {
+    let scanId: String
+    let status: String
+    let statusUrl: String
+
+    enum CodingKeys: String, CodingKey {
+        case scanId = "scan_id"
+        case status
+        case statusUrl = "status_url"
+    }
+}
+
+struct DesignJobStatusResponse: Codable {
+    let job: DesignJob?
+}
+
+struct DesignJob: Codable {
+    let state: String
+    let stage: String?
+    let error: String?
+    let result: SimplifiedResponse?
+}
+
 struct SimplifiedFurnitureItem: Codable, Identifiable {
     let id: String
     let name: String
@@ -10,54 +10,257 @@ Furniture AR Server Handler with Complete Pipeline
 
 from flask import Flask, request, jsonify, send_file
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import sys
 import json
 import uuid
+import hashlib
+import time
+import sqlite3
 import subprocess
-import requests
-from pathlib import Path
+import queue
+import threading
+import atexit
+import asyncio
+import multiprocessing
+import httpx
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlparse
 import shutil
-from typing import List, Dict, Any, Optional
+import copy
+from functools import lru_cache, partial
+from contextlib import closing
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import traceback
 
 app = Flask(__name__)
 
 # Configuration
-BASE_DIR = Path("/home/zliu989/Server")
+BASE_DIR = Path(os.environ.get("FURNISHER_BASE_DIR", "/home/zliu989/Server"))
 SCANS_DIR = BASE_DIR / "scans"
 USDZ_OUTPUTS_DIR = BASE_DIR / "usdz_outputs"
 INSTANTMESH_DIR = Path("/home/zliu989/InstantMesh")
 INSTANTMESH_OUTPUT_DIR = INSTANTMESH_DIR / "outputs/instant-mesh-large/meshes"
-SCRAPER_SCRIPT = BASE_DIR / "scraper.py"
-OBJ_TO_USDZ_SCRIPT = BASE_DIR / "obj_to_usdz.py"
+CACHE_DB_PATH = BASE_DIR / "cache.sqlite3"
+MESH_CACHE_DIR = BASE_DIR / "mesh_cache"
+INSTANTMESH_STAGING_DIR = BASE_DIR / "instantmesh_staging"
 
-for d in [SCANS_DIR, USDZ_OUTPUTS_DIR]:
+for d in [SCANS_DIR, USDZ_OUTPUTS_DIR, MESH_CACHE_DIR]:
     d.mkdir(parents=True, exist_ok=True)
 
+# Gemini, scraper and OBJ -> USDZ helpers are deployed alongside this server in BASE_DIR;
+# import them directly instead of paying interpreter start-up per request
+sys.path.insert(0, str(BASE_DIR))
+
+# The helpers are optional at start-up; /health reports which ones failed to import
+IMPORT_ERRORS: Dict[str, str] = {}
+try:
+    import gemscript
+except ImportError as e:
+    gemscript = None
+    IMPORT_ERRORS["gemscript"] = str(e)
+try:
+    from scraper import GoogleImageScraper
+except ImportError as e:
+    GoogleImageScraper = None
+    IMPORT_ERRORS["scraper"] = str(e)
+try:
+    from obj_to_usdz import convert as obj2usdz
+except ImportError as e:
+    obj2usdz = None
+    IMPORT_ERRORS["obj_to_usdz"] = str(e)
+
 ALLOWED_EXTENSIONS = {"usdz", "usdc"}
+# Only extensions InstantMesh picks up from an input directory; .jpeg images are saved as .jpg
+IMAGE_EXTENSIONS = {"jpg", "png", "webp"}
+
+# Reject oversized room scans before reading them; uploads are copied to disk in 1 MiB blocks
+MAX_UPLOAD_SIZE = 200 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20
+app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_SIZE
+
+# Generated files are immutable per scan_id; let a fronting nginx/apache serve them when configured
+DOWNLOAD_MAX_AGE = 3600
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE") == "1"
+
+# Gemini plans are reused for the same room type, budget bucket and rounded dimensions
+GEMINI_CACHE_TTL = 24 * 60 * 60
+GEMINI_BUDGET_DIGITS = 2
+
+# A Google Images scrape for one design gives up after this long
+SCRAPER_TIMEOUT = 300
+
+# Image downloads are network-bound; this many run at once per request, each written in 256 KiB chunks
+DOWNLOAD_CONCURRENCY = 16
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# InstantMesh starts on whatever images have downloaded after a short wait, up to this many per run
+INSTANTMESH_BATCH_SIZE = 8
+INSTANTMESH_BATCH_WINDOW = 5.0
+
+# Batches from concurrent requests arriving this close together share one InstantMesh run
+INSTANTMESH_COALESCE_WINDOW = 0.3
+INSTANTMESH_MAX_BATCH = 16
+# Longest a pipeline waits for its batch's meshes, queueing behind other runs included
+INSTANTMESH_RESULT_TIMEOUT = 30 * 60
+
+# OBJ -> USDZ conversions are CPU-bound and independent per file
+CONVERT_WORKERS = min(8, os.cpu_count() or 1)
+
+# Conversion workers are started by a forkserver that has already imported obj_to_usdz (and the
+# USD libraries with it) rather than forked from this multithreaded server process
+CONVERT_CONTEXT = multiprocessing.get_context("forkserver")
+CONVERT_CONTEXT.set_forkserver_preload(["obj_to_usdz"])
+
+# Image downloads run as coroutines on one background event loop shared by every request,
+# with a shared HTTP/2 client so fetches to the same CDN reuse (and multiplex over) one connection
+DOWNLOAD_LOOP = asyncio.new_event_loop()
+threading.Thread(target=DOWNLOAD_LOOP.run_forever, name="image-downloads", daemon=True).start()
+
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+    timeout=30.0,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+)
+
+
+@atexit.register
+def _close_http_client():
+    asyncio.run_coroutine_threadsafe(HTTP_CLIENT.aclose(), DOWNLOAD_LOOP).result(timeout=5)
+
+
+# Scrapes run here so the job waiting on them can stop at SCRAPER_TIMEOUT. Every job shares one
+# scraper, so its cached session, pooled connections and request throttle span concurrent jobs
+SCRAPER_POOL = ThreadPoolExecutor(max_workers=2)
+IMAGE_SCRAPER = GoogleImageScraper() if GoogleImageScraper is not None else None
+
+# Design jobs run in the background; clients poll /scan/<scan_id> for JOB_STATUS
+JOB_POOL = ThreadPoolExecutor(max_workers=2)
+JOB_STATUS: Dict[str, Dict] = {}
+JOB_LOCK = threading.Lock()
+# Finished jobs (result payload included) are forgotten this long after they end;
+# their files stay on disk and are still listed by /scan/<scan_id>
+JOB_STATUS_TTL = 60 * 60
+_JOB_FINISHED_AT: Dict[str, float] = {}  # scan_id -> finish time, oldest first
+
+# Marks the end of work handed from one pipeline stage to the next
+_PIPELINE_DONE = object()
 
 
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+@lru_cache(maxsize=None)
+def get_gemini_model():
+    """Configure the Gemini model once and reuse it across requests"""
+    return gemscript.setup_gemini()
+
+
+def init_cache_db():
+    """Create the on-disk cache tables if they don't exist yet"""
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn, conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS gemini_cache "
+            "(key TEXT PRIMARY KEY, plans TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS mesh_cache "
+            "(hash TEXT PRIMARY KEY, obj_path TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dims_cache "
+            "(hash TEXT PRIMARY KEY, dims TEXT)"
+        )
+
+
+init_cache_db()
+
+
+def _budget_bucket(budget: str) -> str:
+    """
+    Round the budget to GEMINI_BUDGET_DIGITS significant figures so similar requests share cache entries
+    The bucket is also the budget Gemini plans for, so it stays within a few percent of the request
+    """
+    try:
+        value = int(round(float(budget)))
+    except (ValueError, OverflowError):
+        return budget
+    return str(round(value, GEMINI_BUDGET_DIGITS - len(str(abs(value)))))
+
+
+def _room_dims(room_type: str, info: Dict) -> Tuple[float, float, float]:
+    """Room (width, length, height) rounded to 0.5m, estimated when the scan has none"""
+    dims = info.get("dimensions") or {}
+    if any(dims.get(k) is None for k in ("width", "length", "height")):
+        dims = gemscript.estimate_room_dimensions(room_type)
+    return tuple(round(dims[k] * 2) / 2 for k in ("width", "length", "height"))
+
+
+@lru_cache(maxsize=512)
+def _cached_gen(room_type: str, budget_bucket: str, width: float, length: float, height: float,
+                ttl_epoch: int) -> str:
+    """
+    Generate search term plans as JSON, cached in memory and in CACHE_DB_PATH
+    ttl_epoch only rotates the in-memory entries once per GEMINI_CACHE_TTL
+    """
+    key = json.dumps([room_type, budget_bucket, width, length, height])
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn:
+        row = conn.execute(
+            "SELECT plans FROM gemini_cache WHERE key = ? AND created > ?",
+            (key, time.time() - GEMINI_CACHE_TTL)
+        ).fetchone()
+    if row:
+        print(f"⚡ Gemini cache hit: {key}")
+        return row[0]
+
+    room_info = {"dimensions": {"width": width, "length": length, "height": height}}
+    plans_json = json.dumps(gemscript.generate_search_terms(get_gemini_model(), room_type, budget_bucket, room_info))
+
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO gemini_cache (key, plans, created) VALUES (?, ?, ?)",
+            (key, plans_json, time.time())
+        )
+    return plans_json
+
+
+def extract_room_info(usdz_path: Path) -> Dict[str, Any]:
+    """Room info from a USDZ scan, memoized by the file's SHA-256 so re-submitted scans skip parsing"""
+    digest = _file_sha256(usdz_path)
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn:
+        row = conn.execute("SELECT dims FROM dims_cache WHERE hash = ?", (digest,)).fetchone()
+    if row:
+        print(f"⚡ Room dimensions cache hit: {digest[:12]}")
+        return {"dimensions": json.loads(row[0])}
+    
+    info = gemscript.extract_usdz_info(usdz_path)
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO dims_cache (hash, dims) VALUES (?, ?)",
+            (digest, json.dumps(info.get("dimensions")))
+        )
+    return info
+
+
 def run_gemini_model(room_scan_path: str, budget: str, room_type: str) -> List[List]:
     """Run Gemini model to generate search term plans"""
     try:
-        cmd = [
-            "python3", "gemscript.py",
-            "--room", room_scan_path,
-            "--budget", budget,
-            "--type", room_type
-        ]
-        print(f"🤖 Running Gemini model: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=BASE_DIR)
+        print(f"🤖 Running Gemini model: room={room_scan_path}, budget={budget}, type={room_type}")
+        if gemscript is None:
+            raise RuntimeError(f"Gemini helpers unavailable: {IMPORT_ERRORS['gemscript']}")
+        info = extract_room_info(Path(room_scan_path))
+        width, length, height = _room_dims(room_type, info)
+        plans = json.loads(_cached_gen(
+            room_type, _budget_bucket(budget), width, length, height,
+            int(time.time() // GEMINI_CACHE_TTL)
+        ))
 
-        if result.returncode != 0:
-            print(f"❌ Gemini model error: {result.stderr}")
-            raise Exception(f"Gemini model failed: {result.stderr}")
-
-        plans = json.loads(result.stdout)
         print(f"✅ Gemini returned {len(plans)} plans with {sum(len(p) for p in plans)} total items")
         return plans
     except Exception as e:
@@ -69,25 +272,14 @@ def run_image_scraper(search_terms: List[str]) -> List[Dict]:
     """Run image scraper to get furniture images"""
     try:
         print(f"🔍 Running image scraper for {len(search_terms)} items...")
+        if IMAGE_SCRAPER is None:
+            raise RuntimeError(f"Scraper unavailable: {IMPORT_ERRORS['scraper']}")
         
-        cmd = [
-            "python3", str(SCRAPER_SCRIPT),
-            "--terms", json.dumps(search_terms)
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=BASE_DIR,
-            timeout=300
-        )
-        
-        if result.returncode != 0:
-            print(f"⚠️ Scraper error: {result.stderr}")
-            raise Exception(f"Scraper failed: {result.stderr}")
-        
-        products = json.loads(result.stdout)
+        future = SCRAPER_POOL.submit(IMAGE_SCRAPER.scrape_multiple, search_terms)
+        try:
+            products = future.result(timeout=SCRAPER_TIMEOUT)
+        except FuturesTimeoutError:
+            raise TimeoutError(f"Scraper did not finish within {SCRAPER_TIMEOUT}s")
         print(f"✅ Scraper returned {len(products)} products")
         return products
         
@@ -97,22 +289,26 @@ def run_image_scraper(search_terms: List[str]) -> List[Dict]:
         raise
 
 
-def download_image(image_url: str, save_path: Path) -> bool:
+def image_extension(image_url: str) -> str:
+    """Image file extension from the URL path (ignoring the query string), defaulting to jpg"""
+    ext = PurePosixPath(urlparse(image_url).path).suffix.lstrip('.').lower()
+    if ext == 'jpeg':
+        return 'jpg'
+    return ext if ext in IMAGE_EXTENSIONS else 'jpg'
+
+
+async def download_image(image_url: str, save_path: Path) -> bool:
     """Download an image from URL and save it"""
     try:
         print(f"  📥 Downloading: {image_url[:60]}...", file=sys.stderr)
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(image_url, headers=headers, timeout=30, stream=True)
-        response.raise_for_status()
-        
-        # Save the image
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        async with HTTP_CLIENT.stream("GET", image_url) as response:
+            response.raise_for_status()
+            
+            # Save the image
+            with open(save_path, 'wb') as f:
+                async for chunk in response.aiter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
         
         print(f"  ✅ Saved to: {save_path.name}")
         return True
@@ -122,9 +318,48 @@ def download_image(image_url: str, save_path: Path) -> bool:
         return False
 
 
-def run_instantmesh(images_dir: Path) -> Dict[str, Path]:
+def _link_or_copy(src: Path, dst: Path):
+    """Hard-link src to dst, falling back to a copy across filesystems"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents, read in 1 MiB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def lookup_cached_mesh(digest: str) -> Optional[Path]:
+    """OBJ previously generated for an image with this SHA-256, if still on disk"""
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn:
+        row = conn.execute("SELECT obj_path FROM mesh_cache WHERE hash = ?", (digest,)).fetchone()
+    if row and Path(row[0]).exists():
+        return Path(row[0])
+    return None
+
+
+def store_cached_mesh(digest: str, obj_path: Path) -> Path:
+    """Copy a generated OBJ into MESH_CACHE_DIR under its image hash and record it"""
+    cached_obj = MESH_CACHE_DIR / f"{digest}.obj"
+    shutil.copyfile(obj_path, cached_obj)
+    with closing(sqlite3.connect(CACHE_DB_PATH)) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO mesh_cache (hash, obj_path) VALUES (?, ?)",
+            (digest, str(cached_obj))
+        )
+    return cached_obj
+
+
+def run_instantmesh(images_dir: Path, prefix: str = "") -> Dict[str, Path]:
     """
     Run InstantMesh on all images in directory
+    prefix: file name prefix shared by this run's images (and so by its OBJs)
     Returns dict mapping image_name -> obj_path
     """
     try:
@@ -155,10 +390,10 @@ def run_instantmesh(images_dir: Path) -> Dict[str, Path]:
         
         print(f"InstantMesh stdout:\n{result.stdout}")
         
-        # Find generated OBJ files
+        # Find OBJ files generated by this run; the prefix keeps other runs' output out
         obj_files = {}
         if INSTANTMESH_OUTPUT_DIR.exists():
-            for obj_file in INSTANTMESH_OUTPUT_DIR.glob("*.obj"):
+            for obj_file in INSTANTMESH_OUTPUT_DIR.glob(f"{prefix}*.obj"):
                 # Extract original image name (without extension)
                 image_name = obj_file.stem
                 obj_files[image_name] = obj_file
@@ -176,79 +411,372 @@ def run_instantmesh(images_dir: Path) -> Dict[str, Path]:
         raise
 
 
-def convert_obj_to_usdz(obj_path: Path, usdz_path: Path) -> bool:
-    """Convert OBJ file to USDZ"""
-    try:
-        print(f"  🔄 Converting {obj_path.name} to USDZ...")
-        
-        # Ensure output directory exists
+class InstantMeshBatcher:
+    """
+    Single thread that owns every InstantMesh run. Image directories submitted within
+    INSTANTMESH_COALESCE_WINDOW of each other (up to INSTANTMESH_MAX_BATCH images) are
+    symlinked into one staging directory and meshed together, then the OBJs are handed
+    back to each submitter by filename prefix
+    """
+
+    def __init__(self, staging_dir: Path):
+        self.staging_dir = staging_dir
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="instantmesh-batcher", daemon=True).start()
+
+    def submit(self, image_dir: Path) -> Future:
+        """Queue every image in image_dir; the future resolves to {image_stem: obj_path}"""
+        future = Future()
+        self._queue.put((image_dir, future))
+        return future
+
+    @staticmethod
+    def _image_count(item: Tuple[Path, Future]) -> Optional[int]:
+        """Images in a submitted directory, or None (failing its future) if it's gone"""
+        image_dir, future = item
+        try:
+            return len(list(image_dir.iterdir()))
+        except OSError as e:  # e.g. the scan was cleaned up while its job was queued
+            future.set_exception(e)
+            return None
+
+    def _run(self):
+        # Nothing may escape this loop: if the thread died, every submitter (current and
+        # future) would wait on its result forever
+        while True:
+            pending = []
+            try:
+                item = self._queue.get()
+                image_count = self._image_count(item)
+                if image_count is None:
+                    continue
+                pending.append(item)
+                deadline = time.monotonic() + INSTANTMESH_COALESCE_WINDOW
+                while image_count < INSTANTMESH_MAX_BATCH:
+                    try:
+                        item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    count = self._image_count(item)
+                    if count is not None:
+                        pending.append(item)
+                        image_count += count
+                self._run_batch(pending)
+            except Exception as e:
+                print(f"❌ InstantMesh batcher error: {e}")
+                traceback.print_exc()
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_batch(self, pending: List[Tuple[Path, Future]]):
+        # Prefixes are unique per run (and across restarts), so OBJs or staging
+        # directories left behind by an earlier run are never picked up or collided with
+        run_id = uuid.uuid4().hex[:12]
+        run_dir = self.staging_dir / f"run_{run_id}"
+        try:
+            run_dir.mkdir(parents=True)
+            linked = []
+            for idx, (image_dir, future) in enumerate(pending):
+                try:
+                    for image_path in image_dir.iterdir():
+                        os.symlink(image_path.resolve(), run_dir / f"r{run_id}_{idx}__{image_path.name}")
+                except OSError as e:
+                    future.set_exception(e)
+                    continue
+                linked.append((idx, future))
+            if not linked:
+                return
+            
+            print(f"🧩 InstantMesh run {run_id}: {len(linked)} batches")
+            obj_files = run_instantmesh(run_dir, prefix=f"r{run_id}_")
+            
+            for idx, future in linked:
+                prefix = f"r{run_id}_{idx}__"
+                future.set_result({stem[len(prefix):]: obj_path
+                                   for stem, obj_path in obj_files.items() if stem.startswith(prefix)})
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+INSTANTMESH_BATCHER = InstantMeshBatcher(INSTANTMESH_STAGING_DIR)
+
+
+class ConversionPool:
+    """One long-lived OBJ -> USDZ process pool shared by every pipeline"""
+
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self._max_workers, mp_context=CONVERT_CONTEXT)
+
+    def submit(self, obj_path: Path, usdz_path: Path) -> Future:
+        """Queue one conversion; the future resolves to obj_to_usdz.convert's result"""
+        if obj2usdz is None:
+            raise RuntimeError(f"obj_to_usdz unavailable: {IMPORT_ERRORS['obj_to_usdz']}")
         usdz_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        cmd = [
-            "python3",
-            str(OBJ_TO_USDZ_SCRIPT),
-            str(obj_path),
-            str(usdz_path)
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=BASE_DIR,
-            timeout=60
-        )
-        
-        if result.returncode != 0:
-            print(f"  ❌ Conversion failed: {result.stderr}")
-            return False
-        
-        if usdz_path.exists():
-            print(f"  ✅ Created: {usdz_path.name}")
-            return True
+        with self._lock:
+            try:
+                return self._pool.submit(obj2usdz, obj_path, usdz_path)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); its conversions have already failed, start afresh
+                print("  ⚠️ Conversion pool broke, restarting it")
+                self._pool = self._new_pool()
+                return self._pool.submit(obj2usdz, obj_path, usdz_path)
+
+    def shutdown(self):
+        with self._lock:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+CONVERT_POOL = ConversionPool(CONVERT_WORKERS)
+atexit.register(CONVERT_POOL.shutdown)
+
+
+async def _fetch_image(image_url: str, targets: List[Tuple[Path, Path]], semaphore: asyncio.Semaphore,
+                       mesh_queue: queue.Queue, result_queue: queue.Queue):
+    """Download one URL and hand every image that uses it to InstantMesh"""
+    async with semaphore:
+        downloaded = await download_image(image_url, targets[0][0])
+    
+    if not downloaded:
+        for image_path, _ in targets:
+            print(f"  ⚠️ Failed to download image for {image_path.stem}")
+            result_queue.put((image_path.stem, "download_failed"))
+        return
+    
+    # Link every repeat before handing any image on: the mesh stage moves images
+    # into its batch directory, so the first download may be gone once it's queued
+    try:
+        for image_path, _ in targets[1:]:
+            _link_or_copy(targets[0][0], image_path)
+    except OSError as e:
+        print(f"  ❌ Failed to copy image for {image_path.stem}: {e}")
+        for image_path, _ in targets:
+            result_queue.put((image_path.stem, "download_failed"))
+        return
+    for image_path, usdz_path in targets:
+        mesh_queue.put((image_path, usdz_path))
+
+
+async def _download_all(tasks: List[Tuple[str, Path, Path]], mesh_queue: queue.Queue, result_queue: queue.Queue):
+    """Download every distinct URL, at most DOWNLOAD_CONCURRENCY at a time"""
+    by_url = {}  # image_url -> [(image_path, usdz_path), ...]
+    for image_url, image_path, usdz_path in tasks:
+        by_url.setdefault(image_url, []).append((image_path, usdz_path))
+    
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    await asyncio.gather(*(
+        _fetch_image(image_url, targets, semaphore, mesh_queue, result_queue)
+        for image_url, targets in by_url.items()
+    ))
+
+
+def _download_stage(tasks: List[Tuple[str, Path, Path]], mesh_queue: queue.Queue, result_queue: queue.Queue):
+    """
+    Pipeline stage 1: download images on DOWNLOAD_LOOP, handing each finished one to InstantMesh
+    Each distinct URL is fetched once; repeats are hard-linked to the first download
+    """
+    try:
+        asyncio.run_coroutine_threadsafe(_download_all(tasks, mesh_queue, result_queue), DOWNLOAD_LOOP).result()
+    finally:
+        mesh_queue.put(_PIPELINE_DONE)
+
+
+def _run_instantmesh_batch(batch_dir: Path, batch: List[Tuple[Path, Path]],
+                           usdz_queue: queue.Queue, result_queue: queue.Queue):
+    """
+    Run InstantMesh on one batch of images and hand the generated OBJs to USDZ conversion
+    Images already meshed (by content hash, in this or an earlier request) skip InstantMesh
+    """
+    pending = {}  # sha256 -> [(image_path, usdz_path), ...] still needing a mesh
+    for image_path, usdz_path in batch:
+        digest = _file_sha256(image_path)
+        cached_obj = lookup_cached_mesh(digest)
+        if cached_obj:
+            print(f"⚡ Reusing mesh for {image_path.stem}: {cached_obj.name}")
+            usdz_queue.put((image_path.stem, cached_obj, usdz_path))
         else:
-            print(f"  ❌ USDZ file not created")
-            return False
-            
+            pending.setdefault(digest, []).append((image_path, usdz_path))
+    
+    if not pending:
+        return
+    
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    for items in pending.values():
+        image_path = items[0][0]
+        shutil.move(str(image_path), str(batch_dir / image_path.name))
+    
+    try:
+        obj_files = INSTANTMESH_BATCHER.submit(batch_dir).result(timeout=INSTANTMESH_RESULT_TIMEOUT)
     except Exception as e:
-        print(f"  ❌ Conversion error: {e}")
-        return False
+        print(f"❌ InstantMesh failed for {batch_dir.name}: {e}")
+        obj_files = {}
+    
+    try:
+        for digest, items in pending.items():
+            mesh_stem = items[0][0].stem  # e.g., "plan_0_furniture_1"
+            obj_path = store_cached_mesh(digest, obj_files[mesh_stem]) if mesh_stem in obj_files else None
+            for image_path, usdz_path in items:
+                if obj_path:
+                    usdz_queue.put((image_path.stem, obj_path, usdz_path))
+                else:
+                    result_queue.put((image_path.stem, "3d_generation_failed"))
+    finally:
+        # The mesh cache holds its own copy; don't let INSTANTMESH_OUTPUT_DIR grow with every run
+        for generated_obj in obj_files.values():
+            generated_obj.unlink(missing_ok=True)
 
 
-@app.route("/generate-design", methods=["POST"])
-def generate_design():
-    """Main endpoint - complete pipeline from room scan to USDZ files"""
+def _instantmesh_stage(batches_dir: Path, mesh_queue: queue.Queue, usdz_queue: queue.Queue,
+                       result_queue: queue.Queue):
+    """
+    Pipeline stage 2: group downloaded images into batches of up to INSTANTMESH_BATCH_SIZE
+    (or whatever arrived within INSTANTMESH_BATCH_WINDOW seconds) and run InstantMesh per batch
+    """
     try:
-        if "file" not in request.files:
-            return jsonify({"error": "No file provided"}), 400
+        done = False
+        batch_idx = 0
+        while not done:
+            item = mesh_queue.get()
+            if item is _PIPELINE_DONE:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + INSTANTMESH_BATCH_WINDOW
+            while len(batch) < INSTANTMESH_BATCH_SIZE:
+                try:
+                    item = mesh_queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _PIPELINE_DONE:
+                    done = True
+                    break
+                batch.append(item)
+            
+            _run_instantmesh_batch(batches_dir / f"batch_{batch_idx}", batch, usdz_queue, result_queue)
+            batch_idx += 1
+    finally:
+        usdz_queue.put(_PIPELINE_DONE)
 
-        file = request.files["file"]
-        if file.filename == "" or not allowed_file(file.filename):
-            return jsonify({"error": "Invalid file"}), 400
 
-        room_type = request.form.get("room_type", "bedroom")
-        budget = request.form.get("budget", "5000")
+def _report_conversion(image_stem: str, result_queue: queue.Queue, future):
+    """Record the outcome of one USDZ conversion"""
+    try:
+        ok = future.result()
+    except Exception as e:
+        print(f"  ❌ Conversion error for {image_stem}: {e}")
+        ok = False
+    else:
+        print(f"  ✅ Created: {image_stem}.usdz" if ok else f"  ❌ Conversion failed: {image_stem}")
+    result_queue.put((image_stem, "ready" if ok else "conversion_failed"))
 
-        print(f"\n{'='*60}")
-        print(f"📥 New request: room_type={room_type}, budget=${budget}")
-        print(f"{'='*60}\n")
 
-        # Create unique scan ID and directory structure
-        scan_id = str(uuid.uuid4())
-        scan_dir = SCANS_DIR / scan_id
-        scan_dir.mkdir(parents=True, exist_ok=True)
+def _usdz_stage(usdz_queue: queue.Queue, result_queue: queue.Queue):
+    """Pipeline stage 3: convert OBJs to USDZ in the shared process pool as soon as InstantMesh produces them"""
+    futures = []
+    while True:
+        item = usdz_queue.get()
+        if item is _PIPELINE_DONE:
+            break
+        image_stem, obj_path, usdz_path = item
+        print(f"  🔄 Converting {obj_path.name} to USDZ...")
+        try:
+            future = CONVERT_POOL.submit(obj_path, usdz_path)
+        except Exception as e:
+            print(f"  ❌ Conversion error for {image_stem}: {e}")
+            result_queue.put((image_stem, "conversion_failed"))
+            continue
+        future.add_done_callback(partial(_report_conversion, image_stem, result_queue))
+        futures.append(future)
+    wait(futures)
 
-        # Save uploaded room scan
-        filename = secure_filename(file.filename)
-        scan_path = scan_dir / filename
-        file.save(scan_path)
-        print(f"💾 Saved room scan: {scan_path}")
+
+def run_asset_pipeline(tasks: List[Tuple[str, Path, Path]], batches_dir: Path,
+                       on_result: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
+    """
+    Download images, generate 3D models and convert them to USDZ as an overlapping
+    three-stage pipeline, so network, GPU and CPU work run at the same time
+    tasks: list of (image_url, image_path, usdz_path)
+    on_result: called with (image_stem, status) as each item finishes
+    Returns dict mapping image stem -> status
+    (ready, download_failed, 3d_generation_failed or conversion_failed)
+    """
+    mesh_queue = queue.Queue()
+    usdz_queue = queue.Queue()
+    result_queue = queue.Queue()
+    
+    stages = [
+        threading.Thread(target=_download_stage, args=(tasks, mesh_queue, result_queue), daemon=True),
+        threading.Thread(target=_instantmesh_stage, args=(batches_dir, mesh_queue, usdz_queue, result_queue), daemon=True),
+        threading.Thread(target=_usdz_stage, args=(usdz_queue, result_queue), daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+    
+    statuses = {}
+    while len(statuses) < len(tasks):
+        try:
+            image_stem, status = result_queue.get(timeout=1)
+        except queue.Empty:
+            if not any(stage.is_alive() for stage in stages):
+                print(f"⚠️ Pipeline stopped with {len(tasks) - len(statuses)} items unaccounted for")
+                break
+            continue
+        statuses[image_stem] = status
+        if on_result:
+            on_result(image_stem, status)
+    
+    for stage in stages:
+        stage.join()
+    return statuses
+
+
+def _update_job(scan_id: str, **fields):
+    """Update the tracked status of a background design job, evicting expired finished ones"""
+    with JOB_LOCK:
+        JOB_STATUS.setdefault(scan_id, {}).update(fields)
+        if fields.get("state") in ("complete", "failed"):
+            _JOB_FINISHED_AT.pop(scan_id, None)  # re-insert so the dict stays oldest-first
+            _JOB_FINISHED_AT[scan_id] = time.monotonic()
+        expired_before = time.monotonic() - JOB_STATUS_TTL
+        while _JOB_FINISHED_AT:
+            oldest, finished_at = next(iter(_JOB_FINISHED_AT.items()))
+            if finished_at > expired_before:
+                break
+            del _JOB_FINISHED_AT[oldest]
+            JOB_STATUS.pop(oldest, None)
+
+
+def _record_item_result(scan_id: str, stem_plans: Dict[str, int], image_stem: str, status: str):
+    """Count a finished furniture item towards its plan's progress"""
+    with JOB_LOCK:
+        plan = JOB_STATUS[scan_id]["plans"][stem_plans[image_stem]]
+        plan["done_items"] += 1
+        if status == "ready":
+            plan["ready_items"] += 1
+
+
+def _run_pipeline(scan_id: str, scan_path: Path, room_type: str, budget: str):
+    """Background job - complete pipeline from room scan to USDZ files, progress kept in JOB_STATUS"""
+    try:
+        scan_dir = scan_path.parent
+        filename = scan_path.name
+        _update_job(scan_id, state="running", stage="generating_plans")
 
         # Step 1: Run Gemini to get furniture search terms
         try:
             furniture_plans = run_gemini_model(str(scan_path), budget, room_type)
         except Exception as e:
-            return jsonify({"error": f"Gemini model failed: {e}", "scan_id": scan_id}), 500
+            _update_job(scan_id, state="failed", error=f"Gemini model failed: {e}")
+            return
 
         # Step 2: Flatten all search terms and run image scraper
         all_search_terms = []
@@ -257,6 +785,7 @@ def generate_design():
                 search_term = item if isinstance(item, str) else item.get("name", "furniture")
                 all_search_terms.append(search_term)
         
+        _update_job(scan_id, stage="scraping_images")
         print(f"\n{'🔍'*30}")
         print(f"Scraping images for {len(all_search_terms)} furniture items")
         print(f"{'🔍'*30}\n")
@@ -264,10 +793,16 @@ def generate_design():
         try:
             scraped_products = run_image_scraper(all_search_terms)
         except Exception as e:
-            return jsonify({"error": f"Image scraper failed: {e}", "scan_id": scan_id}), 500
+            _update_job(scan_id, state="failed", error=f"Image scraper failed: {e}")
+            return
 
-        # Step 3: Process each plan
-        response_plans = []
+        # Step 3: Lay out each plan and collect its image -> USDZ tasks
+        # Images are named plan_X_furniture_Y so every plan can share one directory
+        all_images_dir = scan_dir / "all_images"
+        all_images_dir.mkdir(parents=True, exist_ok=True)
+
+        plan_items = []  # (plan_id, [(furniture_id, image_stem), ...])
+        asset_tasks = []  # (image_url, image_path, usdz_path)
         product_idx = 0
         
         for plan_idx, plan in enumerate(furniture_plans):
@@ -276,16 +811,11 @@ def generate_design():
             print(f"Processing {plan_id} with {len(plan)} furniture items")
             print(f"{'─'*60}")
 
-            # Create directories for this plan
-            plan_images_dir = scan_dir / plan_id / "images"
-            plan_images_dir.mkdir(parents=True, exist_ok=True)
-            
+            # Create output directory for this plan
             plan_usdz_dir = USDZ_OUTPUTS_DIR / scan_id / plan_id
             plan_usdz_dir.mkdir(parents=True, exist_ok=True)
 
-            # Step 4: Download images for this plan
-            image_map = {}  # Maps furniture_id to image filename
-            
+            furniture = []
             for item_idx in range(len(plan)):
                 if product_idx >= len(scraped_products):
                     break
@@ -296,68 +826,54 @@ def generate_design():
                 print(f"\n  📦 {furniture_id}: {product.get('title', 'Unknown')}")
                 
                 if product.get('image'):
-                    # Determine image extension
                     image_url = product['image']
-                    ext = 'jpg'
-                    if '.png' in image_url:
-                        ext = 'png'
-                    elif '.webp' in image_url:
-                        ext = 'webp'
+                    ext = image_extension(image_url)
                     
                     # Save with structured name: plan_X_furniture_Y.ext
-                    image_filename = f"{plan_id}_{furniture_id}.{ext}"
-                    image_path = plan_images_dir / image_filename
-                    
-                    if download_image(image_url, image_path):
-                        image_map[furniture_id] = image_filename
-                    else:
-                        print(f"  ⚠️ Failed to download image for {furniture_id}")
+                    image_stem = f"{plan_id}_{furniture_id}"
+                    image_path = all_images_dir / f"{image_stem}.{ext}"
+                    asset_tasks.append((image_url, image_path, plan_usdz_dir / f"{image_stem}.usdz"))
+                    furniture.append((furniture_id, image_stem))
                 else:
                     print(f"  ⚠️ No image URL for {furniture_id}")
                 
                 product_idx += 1
+
+            plan_items.append((plan_id, furniture))
+
+        # Step 4: Download images, run InstantMesh and convert OBJ files to USDZ
+        _update_job(scan_id, stage="generating_models", plans=[
+            {"plan_id": plan_id, "total_items": len(furniture), "done_items": 0, "ready_items": 0}
+            for plan_id, furniture in plan_items
+        ])
+        stem_plans = {image_stem: plan_idx
+                      for plan_idx, (_, furniture) in enumerate(plan_items)
+                      for _, image_stem in furniture}
+        
+        print(f"\n{'🎨'*30}")
+        print(f"Generating {len(asset_tasks)} furniture models")
+        print(f"{'🎨'*30}\n")
+        statuses = run_asset_pipeline(asset_tasks, scan_dir / "mesh_batches",
+                                      on_result=partial(_record_item_result, scan_id, stem_plans))
+
+        response_plans = []
+        for plan_id, furniture in plan_items:
+            plan_furniture = []
             
-            # Step 5: Run InstantMesh on all images for this plan
-            if image_map:
-                print(f"\n{'🎨'*30}")
-                print(f"Running InstantMesh for {plan_id}")
-                print(f"{'🎨'*30}\n")
-                
-                try:
-                    obj_files = run_instantmesh(plan_images_dir)
-                except Exception as e:
-                    print(f"❌ InstantMesh failed for {plan_id}: {e}")
-                    obj_files = {}
-                
-                # Step 6: Convert OBJ files to USDZ
-                plan_furniture = []
-                
-                for furniture_id, image_filename in image_map.items():
-                    image_stem = Path(image_filename).stem  # e.g., "plan_0_furniture_1"
-                    
-                    furniture_item = {
-                        "furniture_id": furniture_id,
-                        "name": furniture_id.replace('_', ' ').title(),
-                        "status": "pending",
-                        "usdz_url": "",
-                        "position": {"x": 0, "y": 0, "z": 0}
-                    }
-                    
-                    if image_stem in obj_files:
-                        obj_path = obj_files[image_stem]
-                        usdz_filename = f"{image_stem}.usdz"
-                        usdz_path = plan_usdz_dir / usdz_filename
-                        
-                        if convert_obj_to_usdz(obj_path, usdz_path):
-                            furniture_item["status"] = "ready"
-                            furniture_item["usdz_url"] = f"/download/{scan_id}/{plan_id}/{usdz_filename}"
-                        else:
-                            furniture_item["status"] = "conversion_failed"
-                    else:
-                        furniture_item["status"] = "3d_generation_failed"
-                    
-                    plan_furniture.append(furniture_item)
+            for furniture_id, image_stem in furniture:
+                status = statuses.get(image_stem, "3d_generation_failed")
+                if status == "download_failed":
+                    continue
                 
+                plan_furniture.append({
+                    "furniture_id": furniture_id,
+                    "name": furniture_id.replace('_', ' ').title(),
+                    "status": status,
+                    "usdz_url": f"/download/{scan_id}/{plan_id}/{image_stem}.usdz" if status == "ready" else "",
+                    "position": {"x": 0, "y": 0, "z": 0}
+                })
+            
+            if plan_furniture:
                 response_plans.append({
                     "plan_id": plan_id,
                     "furniture": plan_furniture,
@@ -380,7 +896,59 @@ def generate_design():
         print(f"   Ready for AR: {sum(p['ready_items'] for p in response_plans)}")
         print(f"{'='*60}\n")
         
-        return jsonify(response), 200
+        _update_job(scan_id, state="complete", stage="complete", result=response)
+    except Exception as e:
+        print(f"\n❌ Error in design job {scan_id}: {e}")
+        traceback.print_exc()
+        _update_job(scan_id, state="failed", error=str(e))
+
+
+@app.route("/generate-design", methods=["POST"])
+def generate_design():
+    """
+    Main endpoint - saves the room scan and queues the pipeline from room scan to USDZ files
+    Responds 202 right away; poll /scan/<scan_id> for progress and the final result
+    """
+    try:
+        if "file" not in request.files:
+            return jsonify({"error": "No file provided"}), 400
+
+        file = request.files["file"]
+        if file.filename == "" or not allowed_file(file.filename):
+            return jsonify({"error": "Invalid file"}), 400
+
+        room_type = request.form.get("room_type", "bedroom")
+        budget = request.form.get("budget", "5000")
+
+        print(f"\n{'='*60}")
+        print(f"📥 New request: room_type={room_type}, budget=${budget}")
+        print(f"{'='*60}\n")
+
+        # Create unique scan ID and directory structure
+        scan_id = str(uuid.uuid4())
+        scan_dir = SCANS_DIR / scan_id
+        scan_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save uploaded room scan
+        filename = secure_filename(file.filename)
+        scan_path = scan_dir / filename
+        with open(scan_path, "wb") as dst:
+            shutil.copyfileobj(file.stream, dst, length=UPLOAD_CHUNK_SIZE)
+        print(f"💾 Saved room scan: {scan_path}")
+
+        _update_job(scan_id, state="queued", stage="queued")
+        JOB_POOL.submit(_run_pipeline, scan_id, scan_path, room_type, budget)
+
+        return jsonify({
+            "scan_id": scan_id,
+            "status": "queued",
+            "status_url": f"/scan/{scan_id}"
+        }), 202
+
+    except RequestEntityTooLarge:
+        # Raised by the first request.files access once the body is over MAX_CONTENT_LENGTH
+        limit_mb = app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)
+        return jsonify({"error": f"Room scan exceeds the {limit_mb} MB upload limit"}), 413
 
     except Exception as e:
         print(f"\n❌ Error in generate_design: {e}")
@@ -388,6 +956,23 @@ def generate_design():
         return jsonify({"error": str(e)}), 500
 
 
+def send_immutable_file(path: Path):
+    """
+    Send a file that never changes for its scan_id
+    Supports ETag / If-Modified-Since so client retries get a 304 instead of the full body
+    """
+    mimetype = "model/vnd.usdz+zip" if path.suffix == ".usdz" else "application/octet-stream"
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        conditional=True,
+        etag=True,
+        last_modified=path.stat().st_mtime
+    )
+    response.headers["Cache-Control"] = f"public, max-age={DOWNLOAD_MAX_AGE}"
+    return response
+
+
 @app.route("/download/<scan_id>/<path:filepath>", methods=["GET"])
 def download_file(scan_id, filepath):
     """Download USDZ or room scan file"""
@@ -395,12 +980,12 @@ def download_file(scan_id, filepath):
         # Try USDZ outputs first
         usdz_path = USDZ_OUTPUTS_DIR / scan_id / filepath
         if usdz_path.exists():
-            return send_file(usdz_path, mimetype="application/octet-stream")
+            return send_immutable_file(usdz_path)
         
         # Try scans directory
         scan_path = SCANS_DIR / scan_id / filepath
         if scan_path.exists():
-            return send_file(scan_path, mimetype="application/octet-stream")
+            return send_immutable_file(scan_path)
         
         return jsonify({"error": "File not found"}), 404
     except Exception as e:
@@ -409,7 +994,7 @@ def download_file(scan_id, filepath):
 
 @app.route("/scan/<scan_id>", methods=["GET"])
 def get_scan_info(scan_id):
-    """Get information about a specific scan"""
+    """Get information about a specific scan, including design job progress while it runs"""
     try:
         scan_dir = SCANS_DIR / scan_id
         if not scan_dir.exists():
@@ -427,7 +1012,12 @@ def get_scan_info(scan_id):
                         "files": [f.name for f in usdz_files]
                     })
         
-        return jsonify({"scan_id": scan_id, "plans": plans}), 200
+        response = {"scan_id": scan_id, "plans": plans}
+        with JOB_LOCK:
+            if scan_id in JOB_STATUS:
+                response["job"] = copy.deepcopy(JOB_STATUS[scan_id])
+        
+        return jsonify(response), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -441,6 +1031,9 @@ def cleanup_scan(scan_id):
             if d.exists():
                 shutil.rmtree(d)
                 removed.append(str(d))
+        with JOB_LOCK:
+            JOB_STATUS.pop(scan_id, None)
+            _JOB_FINISHED_AT.pop(scan_id, None)
         return jsonify({"message": "Cleanup successful", "deleted": removed}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -451,15 +1044,15 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "scraper_available": SCRAPER_SCRIPT.exists(),
+        "gemini_available": "gemscript" not in IMPORT_ERRORS,
+        "scraper_available": "scraper" not in IMPORT_ERRORS,
         "instantmesh_available": INSTANTMESH_DIR.exists(),
-        "obj_to_usdz_available": OBJ_TO_USDZ_SCRIPT.exists()
+        "obj_to_usdz_available": "obj_to_usdz" not in IMPORT_ERRORS,
+        "import_errors": IMPORT_ERRORS
     }), 200
 
 
 if __name__ == "__main__":
-    import sys
-    
     print("\n" + "="*60)
     print("🚀 Furniture AR Server Starting (Full Pipeline)...")
     print("="*60)
@@ -467,8 +1060,14 @@ if __name__ == "__main__":
     print(f"Scans directory: {SCANS_DIR}")
     print(f"USDZ outputs: {USDZ_OUTPUTS_DIR}")
     print(f"InstantMesh: {INSTANTMESH_DIR}")
-    print(f"Scraper: {SCRAPER_SCRIPT}")
-    print(f"OBJ to USDZ: {OBJ_TO_USDZ_SCRIPT}")
+    print(f"Gemini: {IMPORT_ERRORS.get('gemscript', 'loaded')}")
+    print(f"Scraper: {IMPORT_ERRORS.get('scraper', 'loaded')}")
+    print(f"OBJ to USDZ: {IMPORT_ERRORS.get('obj_to_usdz', 'loaded')}")
     print("="*60 + "\n")
 
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    # The Werkzeug dev server handles one request at a time; production runs under gunicorn
+    if os.environ.get("FLASK_DEV"):
+        app.run(host="0.0.0.0", port=5000, debug=True)
+    else:
+        print("Serve with: gunicorn -c gunicorn.conf.py furniture_ar_server_final:app")
+        print("Set FLASK_DEV=1 to use the development server instead")
\ No newline at end of file
@@ -15,17 +15,55 @@ import json
 import argparse
 import time
 import zipfile
-import tempfile
-import shutil
 import re
+import mmap
 from pathlib import Path
 import google.generativeai as genai
 from typing import List, Dict, Any
 
 
+# Compiled once: bounding-box extent in a USD layer (matched on raw bytes), and the JSON array
+# fallback for Gemini output
+_EXTENT_RE = re.compile(rb"float3\[\]\s+extent\s*=\s*\[(.*?)\]", re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r"\[[\s\S]*\]")
+
+
 # -------------------------------------------------------
 # Gemini Setup
 # -------------------------------------------------------
+# Fixed instructions, sent once as the model's system instruction instead of with every prompt
+SYSTEM_PROMPT = """
+You are an expert interior designer.
+
+You will be given a room type, a total budget and the room dimensions.
+
+Create **3 different design plans** (Modern, Traditional, Minimalist themes).
+Each plan should contain **5–8 furniture or decor search phrases**, describing items
+someone might look up online (e.g. "red leather couch", "oak coffee table", "grey patterned rug").
+
+FORMAT REQUIREMENTS:
+- Output only valid JSON.
+- JSON is a list of lists.
+- Each sublist contains plain strings (search phrases).
+- Each sublist is a plan
+
+Example:
+[
+  ["modern grey couch", "glass coffee table", "black floor lamp"],
+  ["rustic wooden bed", "vintage nightstand"],
+  ["minimalist desk", "ergonomic chair", "white bookshelf"]
+]
+
+Return only the JSON.
+
+DO NOT RETURN ANYTHING THAT GOES ON WALLS
+
+ONLY RETURN A MAX OF 2 PIECES PER PLAN
+
+ONLY RETURN ONE PLAN
+""".strip()
+
+
 def setup_gemini(api_key: str = None):
     """Configure Gemini API"""
     if api_key is None:
@@ -37,51 +75,68 @@ def setup_gemini(api_key: str = None):
     genai.configure(api_key=api_key)
 
     # ✅ No web search tools needed — just plain text generation
-    model = genai.GenerativeModel("gemini-2.0-flash-exp")
+    model = genai.GenerativeModel("gemini-2.0-flash-exp", system_instruction=SYSTEM_PROMPT)
     return model
 
 
 # -------------------------------------------------------
 # USDZ Utilities
 # -------------------------------------------------------
+def parse_usd_extent(content) -> Dict[str, Any]:
+    """Extract dimensions from the extent attribute in USD layer bytes (bytes or mmap)"""
+    match = _EXTENT_RE.search(content)
+    dims = {"width": None, "length": None, "height": None}
+
+    if match:
+        extent = match.group(1).decode("ascii", "ignore")
+        vals = [float(x.strip()) for x in extent.replace("(", "").replace(")", "").split(",")]
+        if len(vals) == 6:
+            dims["width"] = abs(vals[3] - vals[0])
+            dims["height"] = abs(vals[4] - vals[1])
+            dims["length"] = abs(vals[5] - vals[2])
+
+    print(f"📐 Extracted dimensions: {dims}", file=sys.stderr)
+    return dims
+
+
 def parse_usd_file(usd_path: Path) -> Dict[str, Any]:
     """Parse USD/USDC file to extract dimensions"""
     try:
-        with open(usd_path, "r", errors="ignore") as f:
-            content = f.read()
-
-        extent_pattern = r"float3\[\]\s+extent\s*=\s*\[(.*?)\]"
-        match = re.search(extent_pattern, content)
-        dims = {"width": None, "length": None, "height": None}
-
-        if match:
-            vals = [float(x.strip()) for x in match.group(1).replace("(", "").replace(")", "").split(",")]
-            if len(vals) == 6:
-                dims["width"] = abs(vals[3] - vals[0])
-                dims["height"] = abs(vals[4] - vals[1])
-                dims["length"] = abs(vals[5] - vals[2])
-
-        print(f"📐 Extracted dimensions: {dims}", file=sys.stderr)
-        return dims
+        # Scan the file through a read-only memory map instead of loading it into a str
+        with open(usd_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_usd_extent(mm)
     except Exception as e:
         print(f"⚠️  Could not parse USD file: {e}", file=sys.stderr)
         return {"width": None, "length": None, "height": None}
 
 
 def extract_usdz_info(usdz_path: Path) -> Dict[str, Any]:
-    """Extract information from USDZ file"""
+    """Extract information from USDZ file (or a bare .usd/.usdc layer)"""
     try:
-        print(f"📦 Extracting USDZ: {usdz_path.name}", file=sys.stderr)
-        tmpdir = Path(tempfile.mkdtemp())
-        with zipfile.ZipFile(usdz_path, "r") as zf:
-            zf.extractall(tmpdir)
-        usd_files = list(tmpdir.rglob("*.usd")) + list(tmpdir.rglob("*.usdc"))
+        # Scans uploaded as a single layer are not archives; map the file directly
+        if usdz_path.suffix.lower() in (".usd", ".usdc"):
+            print(f"📦 Reading USD: {usdz_path.name}", file=sys.stderr)
+            return {"dimensions": parse_usd_file(usdz_path)}
 
-        dims = parse_usd_file(usd_files[0]) if usd_files else None
-        return {"dimensions": dims, "temp_dir": tmpdir}
+        print(f"📦 Reading USDZ: {usdz_path.name}", file=sys.stderr)
+        # Read only the USD layer out of the archive; textures are never touched
+        with zipfile.ZipFile(usdz_path, "r") as zf:
+            names = zf.namelist()
+            target = (next((n for n in names if n.endswith(".usd")), None)
+                      or next((n for n in names if n.endswith(".usdc")), None))
+            data = zf.read(target) if target else None
+
+        dims = None
+        if data is not None:
+            try:
+                dims = parse_usd_extent(data)
+            except Exception as e:
+                print(f"⚠️  Could not parse USD file: {e}", file=sys.stderr)
+                dims = {"width": None, "length": None, "height": None}
+        return {"dimensions": dims}
     except Exception as e:
         print(f"❌ Error extracting USDZ: {e}", file=sys.stderr)
-        return {"dimensions": None, "temp_dir": None}
+        return {"dimensions": None}
 
 
 # -------------------------------------------------------
@@ -101,7 +156,7 @@ def estimate_room_dimensions(room_type: str) -> Dict[str, float]:
 
 
 def create_prompt(room_type: str, budget: str, dims: Dict) -> str:
-    """Prompt asking Gemini for search terms only"""
+    """Per-request part of the prompt; the fixed instructions live in SYSTEM_PROMPT"""
     width, length, height = (
         dims.get("width", 4.0),
         dims.get("length", 4.5),
@@ -109,39 +164,11 @@ def create_prompt(room_type: str, budget: str, dims: Dict) -> str:
     )
 
     prompt = f"""
-You are an expert interior designer.
-
 Your task is to propose furniture concepts for a {room_type} design project
 with a total budget of about ${budget}.
 
 ROOM DIMENSIONS:
 - {width}m wide × {length}m long × {height}m high
-
-Create **3 different design plans** (Modern, Traditional, Minimalist themes).
-Each plan should contain **5–8 furniture or decor search phrases**, describing items
-someone might look up online (e.g. "red leather couch", "oak coffee table", "grey patterned rug").
-
-FORMAT REQUIREMENTS:
-- Output only valid JSON.
-- JSON is a list of lists.
-- Each sublist contains plain strings (search phrases).
-- Each sublist is a plan
-
-Example:
-[
-  ["modern grey couch", "glass coffee table", "black floor lamp"],
-  ["rustic wooden bed", "vintage nightstand"],
-  ["minimalist desk", "ergonomic chair", "white bookshelf"]
-]
-
-Return only the JSON.
-
-DO NOT RETURN ANYTHING THAT GOES ON WALLS
-
-ONLY RETURN A MAX OF 2 PIECES PER PLAN
-
-ONLY RETURN ONE PLAN
-
 """
     return prompt.strip()
 
@@ -167,7 +194,7 @@ def generate_search_terms(model, room_type: str, budget: str, room_info: Dict) -
         try:
             plans = json.loads(text)
         except json.JSONDecodeError:
-            match = re.search(r"\[[\s\S]*\]", text)
+            match = _JSON_ARRAY_RE.search(text)
             if match:
                 plans = json.loads(match.group(0))
             else:
@@ -200,11 +227,9 @@ def main():
         print(f"❌ Room scan file not found: {args.room}", file=sys.stderr)
         sys.exit(1)
 
-    temp_dir = None
     try:
         model = setup_gemini(args.api_key)
         info = extract_usdz_info(room_path)
-        temp_dir = info.get("temp_dir")
 
         search_plans = generate_search_terms(model, args.type, args.budget, info)
         print(json.dumps(search_plans, indent=2))
@@ -213,10 +238,6 @@ def main():
         print(f"❌ Fatal error: {e}", file=sys.stderr)
         import traceback; traceback.print_exc(file=sys.stderr)
         sys.exit(1)
-    finally:
-        if temp_dir and Path(temp_dir).exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            print("🧹 Cleaned up temporary files", file=sys.stderr)
 
 
 if __name__ == "__main__":
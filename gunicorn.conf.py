@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration for the Furniture AR server
+
+Usage:
+    gunicorn -c gunicorn.conf.py furniture_ar_server_final:app
+"""
+
+bind = "0.0.0.0:5000"
+
+# One worker process: design job status (JOB_STATUS) and the InstantMesh batcher live in
+# process memory, so every request and /scan poll has to reach the same process.
+# Concurrency comes from threads instead.
+workers = 1
+worker_class = "gthread"
+threads = 32
+
+# Uploads and /scan polls are quick, but leave room for slow clients on large room scans
+timeout = 900
+keepalive = 60
+
+# The server starts its download event loop and InstantMesh batcher threads at import time;
+# threads don't survive fork, so the app must be imported in the worker, not the master
+preload_app = False
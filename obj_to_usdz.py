@@ -5,104 +5,323 @@ Handles non-standard OBJ format with RGB values appended to vertex positions.
 
 Usage:
     python obj_to_usdz.py input.obj output.usdz
+
+Library use:
+    from obj_to_usdz import convert
+    convert("input.obj", "output.usdz")
     
 Requirements:
-    pip install usd-core
+    pip install usd-core numpy
+    pip install pyarrow  # optional, faster vertex parsing
 """
 
 import sys
+import io
 import os
 import re
-from pathlib import Path
+import mmap
+import tempfile
+import zipfile
+
+import numpy as np
+
+# Optional: pyarrow's CSV reader parses float columns much faster than numpy's
+# text parser; without it the numpy path is used
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa = None
 
 try:
-    from pxr import Usd, UsdGeom, Vt, Gf, Sdf
+    from pxr import Usd, UsdGeom, Vt
 except ImportError:
+    if __name__ != "__main__":
+        raise
     print("Error: USD Python bindings not found.")
     print("Install with: pip install usd-core")
     sys.exit(1)
 
 
+# Where the .usdc is staged while it's packed into the USDZ: RAM-backed when the
+# host has /dev/shm, so the crate file never hits the disk
+USDC_STAGING_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# OBJ text is parsed in windows of about this many bytes (cut at line ends), so at
+# most one window of text is held in Python memory alongside the output arrays
+PARSE_WINDOW_SIZE = 8 * 1024 * 1024
+
+# Byte values numpy's text parser treats as separators in face data
+_WHITESPACE = np.frombuffer(b' \t\r\n', dtype=np.uint8)
+
+# Payload of each 'v x y z [r g b]' / 'f ...' line (indentation allowed), captured
+# straight from the file bytes
+_VERTEX_LINE_RE = re.compile(rb'^[ \t]*v[ \t]+([^\r\n]*)', re.M)
+_FACE_LINE_RE = re.compile(rb'^[ \t]*f[ \t]+([^\r\n]*)', re.M)
+_LINE_RES = {b'v': _VERTEX_LINE_RE, b'f': _FACE_LINE_RE}
+
+# Any line starting with a space or tab; windows without one can be counted with bytes.count
+_INDENTED_LINE_RE = re.compile(rb'^[ \t]', re.M)
+
+# Strips the /vt/vn part of a face token, leaving the vertex index
+_FACE_ATTRS_RE = re.compile(rb'/\S*')
+
+
+def _parse_float_rows(block, n_rows, n_cols):
+    """
+    Parse a newline-separated block of n_rows lines with n_cols space-separated
+    numbers each.
+    
+    Returns:
+        (n_rows, n_cols) float32 array, or None if the block doesn't have that shape
+    """
+    if pa is not None:
+        names = [str(i) for i in range(n_cols)]
+        try:
+            table = pa_csv.read_csv(
+                io.BytesIO(block),
+                read_options=pa_csv.ReadOptions(column_names=names),
+                parse_options=pa_csv.ParseOptions(delimiter=' '),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={name: pa.float32() for name in names}
+                ),
+            )
+        except pa.ArrowInvalid:
+            table = None  # e.g. tabs or repeated spaces between values
+        if (table is not None and table.num_rows == n_rows
+                and not any(column.null_count for column in table.columns)):
+            values = np.empty((n_rows, n_cols), dtype=np.float32)
+            for i, column in enumerate(table.columns):
+                values[:, i] = column.to_numpy()
+            return values
+    
+    values = np.fromstring(block, dtype=np.float32, sep=' ')
+    if values.size != n_rows * n_cols:
+        return None
+    return values.reshape(n_rows, n_cols)
+
+
+def _parse_vertices_slow(v_lines):
+    """
+    Per-line vertex parse for files whose 'v' lines don't all have the same
+    number of values (e.g. colored and uncolored vertices mixed).
+    Fills preallocated float32 arrays rather than building per-vertex tuples.
+    
+    Returns:
+        vertices: (N, 3) float32 array
+        colors: (N, 3) float32 array, white where a vertex has no color
+    """
+    vertices = np.empty((len(v_lines), 3), dtype=np.float32)
+    colors = np.ones((len(v_lines), 3), dtype=np.float32)  # Default white
+    
+    n = 0
+    for line in v_lines:
+        parts = line.split()
+        if len(parts) >= 6:  # x y z r g b
+            vertices[n] = parts[0:3]
+            colors[n] = parts[3:6]
+        elif len(parts) >= 3:  # x y z (no color)
+            vertices[n] = parts[0:3]
+        else:
+            continue
+        n += 1
+    
+    return vertices[:n], colors[:n]
+
+
+def _tokens_per_line(block, n_lines):
+    """Number of whitespace-separated values on each line of a newline-joined block"""
+    chars = np.frombuffer(block, dtype=np.uint8)
+    is_space = np.isin(chars, _WHITESPACE)
+    # A token starts at a non-space byte that follows a space (or the start of the block)
+    starts = ~is_space
+    starts[1:] &= is_space[:-1]
+    line_ids = np.cumsum(chars == ord('\n'), dtype=np.int32)
+    return np.bincount(line_ids[starts], minlength=n_lines)
+
+
+def _parse_vertices(v_lines):
+    """
+    Parse the payload of every 'v' line in one bulk call (per-line fallback for
+    files whose lines don't all have the same number of values).
+    
+    Returns:
+        vertices: (N, 3) float32 array
+        colors: (N, 3) float32 array, white where the file has no colors
+    """
+    if not v_lines:
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.float32)
+    
+    # The bulk parse only applies when every line has the same number of values;
+    # a matching total alone isn't enough (e.g. 6/5/7 values would shift positions
+    # and colors into each other), so the count is checked per line
+    block = b'\n'.join(v_lines)
+    cols = _tokens_per_line(block, len(v_lines))
+    n_cols = cols[0]
+    values = None
+    if n_cols >= 3 and (cols == n_cols).all():
+        values = _parse_float_rows(block, len(v_lines), n_cols)
+    if values is None:
+        return _parse_vertices_slow(v_lines)
+    
+    vertices = np.ascontiguousarray(values[:, 0:3])
+    if n_cols >= 6:
+        colors = np.ascontiguousarray(values[:, 3:6])
+    else:
+        colors = np.ones((len(vertices), 3), dtype=np.float32)  # Default white
+    
+    return vertices, colors
+
+
+def _parse_faces(f_lines):
+    """
+    Parse the payload of every 'f' line into 0-based triangle indices.
+    All-triangle meshes are reshaped in one go; polygons are fan-triangulated
+    a whole size bucket at a time (so triangles come out grouped by source polygon size
+    within each parse window). Faces with fewer than 3 indices are skipped.
+    
+    Returns:
+        faces: (M, 3) int32 array
+    """
+    if not f_lines:
+        return np.empty((0, 3), dtype=np.int32)
+    
+    # Handle f v, f v/vt, f v/vt/vn, f v//vn formats: keep only the vertex index
+    block = b'\n'.join(f_lines)
+    if b'/' in block:
+        block = _FACE_ATTRS_RE.sub(b'', block)
+    
+    # OBJ uses 1-based indexing, convert to 0-based
+    indices = np.fromstring(block, dtype=np.int32, sep=' ') - 1
+    
+    # Sizes are counted per line: a total of 3 per line could also be e.g. a
+    # degenerate 2-index face next to a quad
+    sizes = _tokens_per_line(block, len(f_lines))
+    if sizes.sum() != indices.size:
+        raise ValueError("Malformed face data in OBJ file")
+    if (sizes == 3).all():
+        return indices.reshape(-1, 3)
+    offsets = np.cumsum(sizes) - sizes
+    
+    # Simple fan triangulation (assuming convex polygons): [f0, fi, fi+1] for each size-k bucket
+    triangles = []
+    for k in np.unique(sizes):
+        if k < 3:
+            continue
+        polygons = indices[offsets[sizes == k][:, None] + np.arange(k)]  # (m, k)
+        fan = np.empty((len(polygons), k - 2, 3), dtype=np.int32)
+        fan[..., 0] = polygons[:, 0:1]
+        fan[..., 1] = polygons[:, 1:k - 1]
+        fan[..., 2] = polygons[:, 2:k]
+        triangles.append(fan.reshape(-1, 3))
+    
+    if not triangles:
+        return np.empty((0, 3), dtype=np.int32)
+    return np.concatenate(triangles)
+
+
+def _iter_windows(data):
+    """Consecutive slices of `data`, about PARSE_WINDOW_SIZE bytes each, cut at line ends"""
+    start, size = 0, len(data)
+    while start < size:
+        end = start + PARSE_WINDOW_SIZE
+        if end < size:
+            cut = data.rfind(b'\n', start, end)
+            if cut < 0:  # a single line longer than the window
+                cut = data.find(b'\n', end)
+            end = size if cut < 0 else cut + 1
+        yield data[start:end]
+        start = end
+
+
+def _count_lines(window, kind):
+    """Number of lines in `window` that _VERTEX_LINE_RE / _FACE_LINE_RE would match for `kind`"""
+    if _INDENTED_LINE_RE.search(window):
+        return sum(1 for _ in _LINE_RES[kind].finditer(window))
+    return sum(window.count(b'\n' + kind + sep) + window.startswith(kind + sep)
+               for sep in (b' ', b'\t'))
+
+
+def _grow_rows(array, min_rows):
+    """Copy of `array` with room for at least min_rows rows"""
+    grown = np.empty((max(min_rows, 2 * len(array)), array.shape[1]), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
 def parse_obj_with_colors(obj_path):
     """
     Parse OBJ file with vertex colors in format:
     v x y z r g b
     
     Returns:
-        vertices: list of (x, y, z) tuples
-        colors: list of (r, g, b) tuples (0-1 range)
-        faces: list of face indices (0-based)
-    """
-    vertices = []
-    colors = []
-    faces = []
-    
-    vertex_count = 0
-    with open(obj_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            
-            # Skip comments and empty lines
-            if not line or line.startswith('#'):
-                continue
-            
-            parts = line.split()
-            if not parts:
-                continue
+        vertices: (N, 3) float32 array of positions
+        colors: (N, 3) float32 array of colors (0-1 range)
+        faces: (M, 3) int32 array of triangle indices (0-based)
+    """
+    # Map the file instead of reading it (no Python-side copy of the whole text,
+    # no UTF-8 decoding). A first pass just counts 'v'/'f' lines so the output arrays
+    # can be allocated once; the second pass parses one window at a time in bulk and
+    # fills them in place, so peak memory is the mesh plus a single window of text
+    with open(obj_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # mmap can't map an empty file
+            return _parse_vertices([]) + (_parse_faces([]),)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n_v_lines = n_f_lines = 0
+            for window in _iter_windows(mm):
+                n_v_lines += _count_lines(window, b'v')
+                n_f_lines += _count_lines(window, b'f')
             
-            # Parse vertex with color
-            if parts[0] == 'v':
-                vertex_count += 1
-                if len(parts) >= 7:  # v x y z r g b
-                    x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                    r, g, b = float(parts[4]), float(parts[5]), float(parts[6])
-                    vertices.append((x, y, z))
-                    colors.append((r, g, b))
-                    
-                    # Debug: print first 3 vertices
-                    if vertex_count <= 3:
-                        print(f"DEBUG Vertex {vertex_count}: pos=({x:.3f}, {y:.3f}, {z:.3f}), color=({r:.3f}, {g:.3f}, {b:.3f})")
-                        
-                elif len(parts) >= 4:  # v x y z (no color)
-                    x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-                    vertices.append((x, y, z))
-                    colors.append((1.0, 1.0, 1.0))  # Default white
-                    if vertex_count <= 3:
-                        print(f"DEBUG Vertex {vertex_count}: NO COLOR - using white")
+            vertices = np.empty((n_v_lines, 3), dtype=np.float32)
+            colors = np.empty((n_v_lines, 3), dtype=np.float32)
+            # One triangle per face line; grown only if the file has polygons
+            faces = np.empty((n_f_lines, 3), dtype=np.int32)
+            n_vertices = n_triangles = 0
             
-            # Parse face (convert to 0-based indexing)
-            elif parts[0] == 'f':
-                face_indices = []
-                for vertex_data in parts[1:]:
-                    # Handle f v, f v/vt, f v/vt/vn, f v//vn formats
-                    vertex_idx = int(vertex_data.split('/')[0])
-                    # OBJ uses 1-based indexing, convert to 0-based
-                    face_indices.append(vertex_idx - 1)
+            for window in _iter_windows(mm):
+                window_vertices, window_colors = _parse_vertices(_VERTEX_LINE_RE.findall(window))
+                end = n_vertices + len(window_vertices)
+                vertices[n_vertices:end] = window_vertices
+                colors[n_vertices:end] = window_colors
+                n_vertices = end
                 
-                # Triangulate if needed (assuming convex polygons)
-                if len(face_indices) == 3:
-                    faces.append(face_indices)
-                elif len(face_indices) > 3:
-                    # Simple fan triangulation
-                    for i in range(1, len(face_indices) - 1):
-                        faces.append([face_indices[0], face_indices[i], face_indices[i + 1]])
+                window_faces = _parse_faces(_FACE_LINE_RE.findall(window))
+                end = n_triangles + len(window_faces)
+                if end > len(faces):
+                    faces = _grow_rows(faces[:n_triangles], end)
+                faces[n_triangles:end] = window_faces
+                n_triangles = end
+    
+    vertices, colors, faces = vertices[:n_vertices], colors[:n_vertices], faces[:n_triangles]
+    
+    # Debug: print first 3 vertices
+    for i, ((x, y, z), (r, g, b)) in enumerate(zip(vertices[:3], colors[:3]), 1):
+        print(f"DEBUG Vertex {i}: pos=({x:.3f}, {y:.3f}, {z:.3f}), color=({r:.3f}, {g:.3f}, {b:.3f})")
     
     return vertices, colors, faces
 
 
+def _package_usdz(layer, output_path, staging_dir):
+    """
+    Write `layer` as the single .usdc entry of a USDZ at output_path.
+    The crate file only exists inside a throwaway directory under staging_dir.
+    """
+    arcname = os.path.splitext(os.path.basename(output_path))[0] + '.usdc'
+    with tempfile.TemporaryDirectory(dir=staging_dir) as tmp_dir:
+        usdc_path = os.path.join(tmp_dir, arcname)
+        if not layer.Export(usdc_path):
+            raise RuntimeError(f"Failed to export {usdc_path}")
+        # USDZ is just a ZIP with no compression
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_STORED) as zipf:
+            zipf.write(usdc_path, arcname)
+
+
 def create_usdz(vertices, colors, faces, output_path):
     """
     Create USDZ file with mesh and vertex colors.
     """
-    # Determine intermediate file format
-    if output_path.endswith('.usdz'):
-        # Create intermediate USDC file
-        intermediate_path = output_path.replace('.usdz', '.usdc')
-    else:
-        intermediate_path = output_path
-    
-    # Create USD stage
-    stage = Usd.Stage.CreateNew(intermediate_path)
+    # Build the stage in memory; it only touches disk when it's exported
+    stage = Usd.Stage.CreateInMemory()
     
     # Set up for USDZ export
     stage.SetDefaultPrim(stage.DefinePrim('/World'))
@@ -112,21 +331,26 @@ def create_usdz(vertices, colors, faces, output_path):
     mesh_path = '/World/Mesh'
     mesh = UsdGeom.Mesh.Define(stage, mesh_path)
     
-    # Set vertices
-    points = Vt.Vec3fArray([Gf.Vec3f(v[0], v[1], v[2]) for v in vertices])
+    # Set vertices (straight from the (N, 3) float32 buffer)
+    points = Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(vertices, dtype=np.float32))
     mesh.GetPointsAttr().Set(points)
     
+    # Author the bounding box too (so readers don't have to compute it), in one vectorized pass
+    if len(vertices):
+        extent = np.stack([vertices.min(axis=0), vertices.max(axis=0)]).astype(np.float32)
+        mesh.GetExtentAttr().Set(Vt.Vec3fArray.FromNumpy(extent))
+    
     # Set face vertex counts (all triangles = 3)
-    face_vertex_counts = Vt.IntArray([len(face) for face in faces])
+    face_vertex_counts = Vt.IntArray.FromNumpy(np.full(len(faces), 3, dtype=np.int32))
     mesh.GetFaceVertexCountsAttr().Set(face_vertex_counts)
     
-    # Set face vertex indices (flatten the faces list)
-    face_vertex_indices = Vt.IntArray([idx for face in faces for idx in face])
+    # Set face vertex indices (flatten the faces array)
+    face_vertex_indices = Vt.IntArray.FromNumpy(np.ascontiguousarray(faces, dtype=np.int32).ravel())
     mesh.GetFaceVertexIndicesAttr().Set(face_vertex_indices)
     
     # Set vertex colors - use displayColor primvar only (most compatible)
     color_primvar = mesh.CreateDisplayColorPrimvar(UsdGeom.Tokens.vertex)
-    color_array = Vt.Vec3fArray([Gf.Vec3f(c[0], c[1], c[2]) for c in colors])
+    color_array = Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(colors, dtype=np.float32))
     color_primvar.Set(color_array)
     
     # Explicitly set interpolation to vertex
@@ -134,46 +358,46 @@ def create_usdz(vertices, colors, faces, output_path):
     
     # Set displayOpacity for completeness
     opacity_primvar = mesh.CreateDisplayOpacityPrimvar(UsdGeom.Tokens.vertex)
-    opacity_array = Vt.FloatArray([1.0] * len(colors))
+    opacity_array = Vt.FloatArray.FromNumpy(np.ones(len(colors), dtype=np.float32))
     opacity_primvar.Set(opacity_array)
     opacity_primvar.SetInterpolation(UsdGeom.Tokens.vertex)
     
-    # Save the stage
-    stage.GetRootLayer().Save()
-    print(f"Created USD file: {intermediate_path}")
+    layer = stage.GetRootLayer()
+    
+    if not output_path.endswith('.usdz'):
+        layer.Export(output_path)
+        print(f"Created USD file: {output_path}")
+        return
     
-    # Convert to USDZ if output has .usdz extension
-    if output_path.endswith('.usdz'):
-        # Create USDZ using Python's zipfile (USDZ is just a ZIP with no compression)
+    try:
         try:
-            import zipfile
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_STORED) as zipf:
-                # Add the USDC file to the root of the archive
-                arcname = os.path.basename(intermediate_path)
-                zipf.write(intermediate_path, arcname)
-            
-            print(f"Created USDZ file: {output_path}")
-            
-            # Clean up temporary usdc file
-            if os.path.exists(intermediate_path):
-                os.remove(intermediate_path)
-                
-        except Exception as e:
-            print(f"Warning: Failed to create USDZ: {e}")
-            print(f"Saved as USDC instead: {intermediate_path}")
+            _package_usdz(layer, output_path, USDC_STAGING_DIR)
+        except Exception:
+            if USDC_STAGING_DIR is None:
+                raise
+            # RAM-backed scratch too small for this mesh (e.g. a container's /dev/shm)
+            _package_usdz(layer, output_path, None)
+        print(f"Created USDZ file: {output_path}")
+    except Exception as e:
+        intermediate_path = output_path[:-len('.usdz')] + '.usdc'
+        print(f"Warning: Failed to create USDZ: {e}")
+        layer.Export(intermediate_path)
+        print(f"Saved as USDC instead: {intermediate_path}")
 
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: python obj_to_usdz.py input.obj output.usdz")
-        sys.exit(1)
+def convert(obj_path, usdz_path):
+    """
+    Convert an OBJ file with vertex colors to USDZ.
     
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
+    Returns:
+        True if the output file was written, False otherwise
+    """
+    input_path = str(obj_path)
+    output_path = str(usdz_path)
     
     if not os.path.exists(input_path):
         print(f"Error: Input file not found: {input_path}")
-        sys.exit(1)
+        return False
     
     print(f"Reading OBJ file: {input_path}")
     vertices, colors, faces = parse_obj_with_colors(input_path)
@@ -182,7 +406,7 @@ def main():
     
     if len(vertices) == 0:
         print("Error: No vertices found in OBJ file")
-        sys.exit(1)
+        return False
     
     if len(colors) != len(vertices):
         print(f"Warning: Color count ({len(colors)}) doesn't match vertex count ({len(vertices)})")
@@ -191,6 +415,16 @@ def main():
     create_usdz(vertices, colors, faces, output_path)
     
     print("Conversion complete!")
+    return os.path.exists(output_path)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python obj_to_usdz.py input.obj output.usdz")
+        sys.exit(1)
+    
+    if not convert(sys.argv[1], sys.argv[2]):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -13,108 +13,237 @@ import json
 import sys
 import time
 import random
-from typing import List, Dict, Any
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
 from urllib.parse import quote_plus
-import requests
+from requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from requests_cache import CachedSession
 from bs4 import BeautifulSoup
 import re
 
+# Optional: selectolax's Lexbor parser builds the DOM far faster than
+# BeautifulSoup; without it Methods 2-4 fall back to BeautifulSoup + lxml
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+# Search result pages are cached on disk so repeat terms skip Google entirely
+CACHE_PATH = Path(__file__).resolve().parent / "google_img_cache.sqlite"
+CACHE_EXPIRE_AFTER = 24 * 60 * 60  # seconds
+
+# Google Images embeds result data in JavaScript objects. One pass over the page
+# picks up all three shapes; the capturing group says which one matched:
+#   1. encrypted thumbnail URLs
+#   2. direct image file URLs
+#   3. [url, width, height] entries whose URL is neither of the above
+# Shape 3 starts one byte earlier (at the '['), so its lookaheads hand thumbnail and
+# file URLs inside [url, w, h] entries back to shapes 1 and 2 - otherwise they'd be
+# misfiled as the lowest-priority kind.
+# Page-level patterns are bytes patterns: they run on the raw response body,
+# so the page is never decoded as a whole.
+_TBN_URL = rb'https://encrypted-tbn\d\.gstatic\.com/images\?q=tbn:[^"]+'
+_FILE_URL = rb'https://[^"]+\.(?:jpg|jpeg|png|webp)[^"]*'
+_IMG_RE = re.compile(
+    rb'"(' + _TBN_URL + rb')"'
+    rb'|"(' + _FILE_URL + rb')"'
+    rb'|\["(?!' + _TBN_URL + rb'")(?!' + _FILE_URL + rb'")(https://[^"]+)",\d+,\d+\]'
+)
+
+# Last-resort sweep for any image file URL in the page
+_ANY_IMG_URL_RE = re.compile(rb'https://[^\s"\'<>]+\.(?:jpg|jpeg|png|webp)')
+
+# Encrypted thumbnail URLs inside <script> text (already decoded by the parser)
+_TBN_URL_RE = re.compile(r'https://encrypted-tbn\d\.gstatic\.com/images\?q=tbn:[A-Za-z0-9_-]+')
+
+# Google UI elements (bar icons, branding, logos, spinners) that are never product images
+_SKIP_RE = re.compile(
+    r'ssl\.gstatic\.com/gb/images/bar'
+    r'|www\.gstatic\.com/images/branding'
+    r'|www\.google\.com/images/branding'
+    r'|/logos/|logo\.png|icon\.png|favicon|loading\.gif|placeholder',
+    re.IGNORECASE,
+)
+
+# Anything that looks like an image URL, including Google's encrypted-tbn image cache
+_IMG_HINT_RE = re.compile(r'\.jpe?g|\.png|\.webp|image|img|photo|encrypted-tbn', re.IGNORECASE)
+
+
+def _parse_html(html: bytes):
+    """DOM for Methods 2-4: a Lexbor tree if selectolax is installed, else a soup"""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    return BeautifulSoup(html, 'lxml')
+
+
+def _iter_tag_attrs(dom, tag: str) -> Iterator[Dict[str, Any]]:
+    """Attributes of every `tag` element, whichever parser built the DOM"""
+    if isinstance(dom, BeautifulSoup):
+        for element in dom.find_all(tag):
+            yield element.attrs
+    else:
+        for node in dom.css(tag):
+            yield node.attributes
+
+
+def _iter_script_texts(dom) -> Iterator[str]:
+    """Text of every <script> element, whichever parser built the DOM"""
+    if isinstance(dom, BeautifulSoup):
+        for script in dom.find_all('script'):
+            yield script.string
+    else:
+        for node in dom.css('script'):
+            yield node.text(deep=True)
+
 
 class GoogleImageScraper:
     """Improved scraper that gets actual furniture images"""
     
-    def __init__(self, delay_range=(1, 3)):
-        self.delay_range = delay_range
-        self.session = requests.Session()
+    def __init__(self, requests_per_second=1.0, max_workers=8, cache_path=CACHE_PATH):
+        self.max_workers = max_workers
+        # Searches run in parallel, but their start times are spaced so Google
+        # sees roughly `requests_per_second` across all workers
+        self.min_interval = 1.0 / requests_per_second
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        # Only successful pages are cached, so failed searches are retried next run
+        self.session = CachedSession(
+            str(cache_path),
+            backend='sqlite',
+            expire_after=CACHE_EXPIRE_AFTER,
+            allowable_codes=(200,),
+        )
+        # Keep connections to Google alive across searches; retry throttling / transient errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         ]
-    
-    def _get_headers(self):
-        return {
-            'User-Agent': random.choice(self.user_agents),
+        # Round-robin: spreads searches evenly over the UAs (next() on a cycle is
+        # safe to share between the scrape_multiple workers)
+        self._user_agent_cycle = itertools.cycle(self.user_agents)
+        # Everything but the User-Agent is the same on every request, so build it once
+        self._base_headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # Only advertise codings urllib3 can decode here (br needs brotli installed)
+            'Accept-Encoding': ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
     
-    def _delay(self):
-        time.sleep(random.uniform(*self.delay_range))
+    def _get_headers(self):
+        headers = self._base_headers.copy()
+        headers['User-Agent'] = next(self._user_agent_cycle)
+        return headers
+    
+    @staticmethod
+    def _search_url(search_term: str) -> str:
+        return f"https://www.google.com/search?q={quote_plus(search_term)}&tbm=isch&hl=en"
+    
+    def _is_fresh_in_cache(self, url: str) -> bool:
+        """True if a GET of url would be answered from the cache (present and not expired)"""
+        cached = self.session.cache.get_response(self.session.cache.create_key(Request('GET', url)))
+        return cached is not None and not cached.is_expired
+    
+    def _throttle(self):
+        """Block until this worker's turn under the shared request rate (with jitter)"""
+        with self._rate_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + self.min_interval * random.uniform(0.5, 1.5)
+        time.sleep(start_at - now)
     
     def _is_valid_image_url(self, url: str) -> bool:
         """Check if URL is likely a real product image"""
         if not url or len(url) < 20:
             return False
         
-        # Skip Google UI elements
-        skip_patterns = [
-            'ssl.gstatic.com/gb/images/bar',  # Google bar icons
-            'www.gstatic.com/images/branding',  # Google branding
-            'www.google.com/images/branding',
-            '/logos/',
-            'logo.png',
-            'icon.png',
-            'favicon',
-            'loading.gif',
-            'placeholder',
-        ]
-        
-        url_lower = url.lower()
-        for pattern in skip_patterns:
-            if pattern in url_lower:
-                return False
-        
         # Must be http/https
         if not url.startswith(('http://', 'https://')):
             return False
         
-        # Check for image-like patterns
-        has_image_indicator = any([
-            '.jpg' in url_lower,
-            '.jpeg' in url_lower,
-            '.png' in url_lower,
-            '.webp' in url_lower,
-            'image' in url_lower,
-            'img' in url_lower,
-            'photo' in url_lower,
-            'encrypted-tbn' in url_lower,  # Google's image cache
-        ])
-        
-        return has_image_indicator
+        # Skip Google UI elements, then require something image-like
+        if _SKIP_RE.search(url):
+            return False
+        return _IMG_HINT_RE.search(url) is not None
     
-    def _extract_images_from_json(self, html: str) -> List[str]:
-        """Extract image URLs from embedded JSON data in the page"""
-        images = []
-        
-        # Google Images embeds data in JavaScript objects
-        # Look for patterns like ["https://...",width,height]
-        patterns = [
-            r'"(https://encrypted-tbn\d\.gstatic\.com/images\?q=tbn:[^"]+)"',
-            r'"(https://[^"]+\.(?:jpg|jpeg|png|webp)[^"]*)"',
-            r'\["(https://[^"]+)",\d+,\d+\]',  # [url, width, height] format
-        ]
+    def _iter_images_from_json(self, html: bytes) -> Iterator[str]:
+        """Yield image URLs from embedded JSON data in the page, best kind first"""
+        # Thumbnails are the preferred kind, so they're yielded the moment they're
+        # matched and the caller can stop scanning there; file URLs and [url, w, h]
+        # entries only matter if the page has no usable thumbnail, so they're held
+        # back until the scan is done (each in page order)
+        deferred = ([], [])
         
-        for pattern in patterns:
-            matches = re.findall(pattern, html)
-            for match in matches:
-                # Clean up the URL
-                url = match.replace('\\u003d', '=').replace('\\u0026', '&')
-                if self._is_valid_image_url(url):
-                    images.append(url)
+        for match in _IMG_RE.finditer(html):
+            # Decode just this URL, then clean it up
+            url = match.group(match.lastindex).decode('utf-8', 'ignore')
+            url = url.replace('\\u003d', '=').replace('\\u0026', '&')
+            if not self._is_valid_image_url(url):
+                continue
+            if match.lastindex == 1:
+                yield url
+            else:
+                deferred[match.lastindex - 2].append(url)
         
-        return images
+        yield from deferred[0]
+        yield from deferred[1]
+    
+    def _iter_json_urls(self, html: bytes) -> Iterator[str]:
+        """Method 1: image URLs from JSON-like structures in the page"""
+        for img_url in self._iter_images_from_json(html):
+            if len(img_url) > 50:  # Decent length URL
+                yield img_url
+    
+    def _iter_img_tag_urls(self, dom) -> Iterator[str]:
+        """Method 2: img tags with actual images"""
+        for attrs in _iter_tag_attrs(dom, 'img'):
+            src = attrs.get('src') or attrs.get('data-src') or ''
+            if self._is_valid_image_url(src) and len(src) > 50:
+                yield src
+    
+    def _iter_link_attr_urls(self, dom) -> Iterator[str]:
+        """Method 3: image URLs in any attribute of 'a' tags"""
+        for attrs in _iter_tag_attrs(dom, 'a'):
+            for attr, value in attrs.items():
+                if isinstance(value, str) and self._is_valid_image_url(value) and len(value) > 50:
+                    yield value
+    
+    def _iter_script_urls(self, dom) -> Iterator[str]:
+        """Method 4: encrypted thumbnail URLs inside scripts"""
+        for script_text in _iter_script_texts(dom):
+            if script_text and 'encrypted-tbn' in script_text:
+                yield from _TBN_URL_RE.findall(script_text)
+    
+    def _iter_pattern_urls(self, html: bytes) -> Iterator[str]:
+        """Method 5: last resort - ANY reasonable image URL in the page"""
+        for match in _ANY_IMG_URL_RE.finditer(html):
+            img_url = match.group().decode('utf-8', 'ignore')
+            if self._is_valid_image_url(img_url) and len(img_url) > 50:
+                yield img_url
     
     def get_image(self, search_term: str) -> Dict[str, Any]:
         """
         Search Google Images and get the FIRST valid image
         """
         # Use Google Images search
-        url = f"https://www.google.com/search?q={quote_plus(search_term)}&tbm=isch&hl=en"
+        url = self._search_url(search_term)
         
         print(f"  🔍 Searching images for: '{search_term}'", file=sys.stderr)
         
@@ -133,59 +262,37 @@ class GoogleImageScraper:
                 'search_term': search_term
             }
             
-            # Get the HTML
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Method 1: Extract from JSON-like structures in the page
-            json_images = self._extract_images_from_json(html)
-            if json_images:
-                # Get the first valid one
-                for img_url in json_images:
-                    if len(img_url) > 50:  # Decent length URL
-                        product['image'] = img_url
-                        print(f"  ✅ Found image (JSON): {img_url[:80]}...", file=sys.stderr)
-                        return product
+            # Raw HTML bytes (already gunzipped): skips charset detection and
+            # decoding the whole page; BeautifulSoup accepts bytes as well
+            html = response.content
             
-            # Method 2: Look for img tags with actual images
-            images = soup.find_all('img')
-            for img in images:
-                src = img.get('src', '') or img.get('data-src', '')
-                
-                if self._is_valid_image_url(src) and len(src) > 50:
-                    product['image'] = src
-                    print(f"  ✅ Found image (img tag): {src[:80]}...", file=sys.stderr)
-                    return product
+            # The DOM is only built once Method 1 comes up empty, then shared by Methods 2-4
+            dom = None
             
-            # Method 3: Look in all 'a' tags for data attributes
-            links = soup.find_all('a')
-            for link in links:
-                # Check all attributes for image URLs
-                for attr, value in link.attrs.items():
-                    if isinstance(value, str) and self._is_valid_image_url(value) and len(value) > 50:
-                        product['image'] = value
-                        print(f"  ✅ Found image (link attr): {value[:80]}...", file=sys.stderr)
-                        return product
+            def get_dom():
+                nonlocal dom
+                if dom is None:
+                    dom = _parse_html(html)
+                return dom
             
-            # Method 4: Search for specific Google Images patterns in scripts
-            scripts = soup.find_all('script')
-            for script in scripts:
-                script_text = script.string
-                if script_text and 'encrypted-tbn' in script_text:
-                    # Find all encrypted thumbnail URLs
-                    matches = re.findall(r'https://encrypted-tbn\d\.gstatic\.com/images\?q=tbn:[A-Za-z0-9_-]+', script_text)
-                    if matches:
-                        product['image'] = matches[0]
-                        print(f"  ✅ Found image (script): {matches[0][:80]}...", file=sys.stderr)
-                        return product
-            
-            # Method 5: Last resort - look for ANY reasonable image URL in the page
-            all_urls = re.findall(r'https://[^\s"\'<>]+\.(?:jpg|jpeg|png|webp)', html)
-            for img_url in all_urls:
-                if self._is_valid_image_url(img_url) and len(img_url) > 50:
-                    product['image'] = img_url
-                    print(f"  ✅ Found image (pattern): {img_url[:80]}...", file=sys.stderr)
-                    return product
+            # Each method is a generator, tried in order; the first URL any of them
+            # yields wins, so later methods (and their DOM scans) never run
+            methods = (
+                ('JSON', lambda: self._iter_json_urls(html)),
+                ('img tag', lambda: self._iter_img_tag_urls(get_dom())),
+                ('link attr', lambda: self._iter_link_attr_urls(get_dom())),
+                ('script', lambda: self._iter_script_urls(get_dom())),
+                ('pattern', lambda: self._iter_pattern_urls(html)),
+            )
+            found = next(
+                ((label, img_url) for label, method in methods for img_url in method()),
+                None,
+            )
+            if found:
+                label, img_url = found
+                product['image'] = img_url
+                print(f"  ✅ Found image ({label}): {img_url[:80]}...", file=sys.stderr)
+                return product
             
             print(f"  ⚠️  No valid image found for '{search_term}'", file=sys.stderr)
             return product
@@ -211,14 +318,23 @@ class GoogleImageScraper:
         print(f"🖼️  Scraping images for {len(search_terms)} items", file=sys.stderr)
         print(f"{'='*60}\n", file=sys.stderr)
         
-        results = []
-        for idx, term in enumerate(search_terms, 1):
+        def scrape_one(idx, term):
+            # Cache hits never reach Google, so they don't wait for a rate slot
+            if not self._is_fresh_in_cache(self._search_url(term)):
+                self._throttle()
             print(f"[{idx}/{len(search_terms)}]", file=sys.stderr)
-            product = self.get_image(term)
-            results.append(product)
-            
-            if idx < len(search_terms):
-                self._delay()
+            return self.get_image(term)
+        
+        # Network-bound, so threads overlap the request round-trips;
+        # results keep the order of search_terms
+        results = [None] * len(search_terms)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(scrape_one, idx, term): idx - 1
+                for idx, term in enumerate(search_terms, 1)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         
         images_found = len([r for r in results if r['image']])
         print(f"\n{'='*60}", file=sys.stderr)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The server imports these modules from BASE_DIR; the tests import them from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
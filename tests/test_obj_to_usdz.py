@@ -0,0 +1,193 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pxr")
+
+import obj_to_usdz
+
+
+def parse(tmp_path, text, newline="\n"):
+    path = tmp_path / "mesh.obj"
+    lines = [line.strip() for line in text.strip().splitlines()]
+    path.write_bytes(newline.join(lines).encode() + newline.encode())
+    return obj_to_usdz.parse_obj_with_colors(str(path))
+
+
+def reference_parse(text):
+    """Straightforward per-line parse with the converter's semantics"""
+    vertices, colors, faces = [], [], []
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "v" and len(parts) >= 4:
+            vertices.append([float(p) for p in parts[1:4]])
+            colors.append([float(p) for p in parts[4:7]] if len(parts) >= 7 else [1.0, 1.0, 1.0])
+        elif parts[0] == "f":
+            idx = [int(p.split("/")[0]) - 1 for p in parts[1:]]
+            faces.extend([idx[0], idx[i], idx[i + 1]] for i in range(1, len(idx) - 1))
+    return (np.array(vertices, dtype=np.float32).reshape(-1, 3),
+            np.array(colors, dtype=np.float32).reshape(-1, 3),
+            np.array(faces, dtype=np.int32).reshape(-1, 3))
+
+
+def sorted_rows(faces):
+    # Polygons are triangulated a size bucket at a time, so only the set of triangles is fixed
+    return faces[np.lexsort(faces.T[::-1])]
+
+
+@pytest.fixture(params=[True, False], ids=["pyarrow", "numpy"])
+def float_parser(request, monkeypatch):
+    if request.param:
+        if obj_to_usdz.pa is None:
+            pytest.skip("pyarrow not installed")
+    else:
+        monkeypatch.setattr(obj_to_usdz, "pa", None)
+
+
+def test_colored_vertices_and_triangles(tmp_path, float_parser):
+    vertices, colors, faces = parse(tmp_path, """
+        v 0 0 0 1 0 0
+        v 1 0 0 0 1 0
+        v 1 1 0 0 0 1
+        f 1 2 3
+    """)
+    assert vertices.dtype == np.float32 and colors.dtype == np.float32 and faces.dtype == np.int32
+    np.testing.assert_array_equal(vertices, [[0, 0, 0], [1, 0, 0], [1, 1, 0]])
+    np.testing.assert_array_equal(colors, [[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+    np.testing.assert_array_equal(faces, [[0, 1, 2]])
+
+
+def test_ragged_vertex_lines_keep_positions_and_colors_apart(tmp_path, float_parser):
+    # 6 + 5 + 7 values adds up to 3 lines x 6, but no line may borrow from another
+    vertices, colors, _ = parse(tmp_path, """
+        v 0 0 0 0.1 0.2 0.3
+        v 1 1 1 0.5 0.5
+        v 2 2 2 0.4 0.5 0.6 9
+    """)
+    np.testing.assert_array_equal(vertices, [[0, 0, 0], [1, 1, 1], [2, 2, 2]])
+    np.testing.assert_allclose(colors, [[0.1, 0.2, 0.3], [1, 1, 1], [0.4, 0.5, 0.6]])
+
+
+def test_uncolored_vertices_are_white(tmp_path, float_parser):
+    _, colors, _ = parse(tmp_path, """
+        v 0 0 0
+        v 1 0 0 0.5 0.5 0.5
+        v 1 1 0
+    """)
+    np.testing.assert_allclose(colors, [[1, 1, 1], [0.5, 0.5, 0.5], [1, 1, 1]])
+
+
+def test_degenerate_faces_are_skipped(tmp_path):
+    # 2 + 4 indices adds up to 2 lines x 3, but neither line is a triangle
+    _, _, faces = parse(tmp_path, """
+        v 0 0 0
+        v 1 0 0
+        v 1 1 0
+        v 0 1 0
+        f 1 2
+        f 1 2 3 4
+    """)
+    np.testing.assert_array_equal(faces, [[0, 1, 2], [0, 2, 3]])
+
+
+def test_mixed_arity_faces_are_fan_triangulated(tmp_path):
+    _, _, faces = parse(tmp_path, """
+        v 0 0 0
+        f 1 2 3
+        f 1 2 3 4 5
+        f 2 3 4 5
+    """)
+    np.testing.assert_array_equal(
+        sorted_rows(faces),
+        sorted_rows(np.array([[0, 1, 2], [0, 1, 2], [0, 2, 3], [0, 3, 4], [1, 2, 3], [1, 3, 4]])),
+    )
+
+
+def test_face_tokens_with_texture_and_normal_indices(tmp_path):
+    _, _, faces = parse(tmp_path, """
+        v 0 0 0
+        vt 0 0
+        vn 0 0 1
+        f 1/1/1 2/2/1 3/3/1
+        f 1//1 3//1 4//1
+        f 2/1 3/1 4/1
+    """)
+    np.testing.assert_array_equal(faces, [[0, 1, 2], [0, 2, 3], [1, 2, 3]])
+
+
+def test_crlf_line_endings(tmp_path, float_parser):
+    text = """
+        v 0 0 0 1 0 0
+        v 1 0 0 0 1 0
+        v 1 1 0 0 0 1
+        f 1 2 3
+    """
+    crlf = parse(tmp_path, text, newline="\r\n")
+    lf = parse(tmp_path, text)
+    for a, b in zip(crlf, lf):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_indented_lines(tmp_path, float_parser):
+    text = "# exported\n  v 0 0 0 1 0 0\n\tv 1 0 0\n  v 1 1 0 0 0 1\n    f 1 2 3\n\tvn 0 0 1\n"
+    path = tmp_path / "mesh.obj"
+    path.write_bytes(text.encode())
+    vertices, colors, faces = obj_to_usdz.parse_obj_with_colors(str(path))
+    expected = reference_parse(text)
+    np.testing.assert_array_equal(vertices, expected[0])
+    np.testing.assert_array_equal(colors, expected[1])
+    np.testing.assert_array_equal(faces, expected[2])
+    assert len(vertices) == 3 and len(faces) == 1
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.obj"
+    path.write_bytes(b"")
+    vertices, colors, faces = obj_to_usdz.parse_obj_with_colors(str(path))
+    assert vertices.shape == colors.shape == faces.shape == (0, 3)
+
+
+@pytest.mark.parametrize("window_size", [37, 1000, 64 * 1024, obj_to_usdz.PARSE_WINDOW_SIZE])
+def test_window_size_does_not_change_the_result(tmp_path, monkeypatch, float_parser, window_size):
+    rng = random.Random(1)
+    lines = []
+    for i in range(3000):
+        sep = "\t" if rng.random() < 0.1 else " "
+        line = f"v{sep}{rng.random():.4f} {rng.random():.4f} {rng.random():.4f}"
+        if rng.random() < 0.5:
+            line += f" {rng.random():.3f} {rng.random():.3f} {rng.random():.3f}"
+        lines.append(line)
+        if i > 10 and rng.random() < 0.5:
+            k = rng.choice([3, 3, 4, 5])
+            lines.append("f " + " ".join(f"{rng.randint(1, i)}/1/1" for _ in range(k)))
+        if rng.random() < 0.05:
+            lines.append("vn 0 0 1")
+    text = "\n".join(lines)
+    
+    monkeypatch.setattr(obj_to_usdz, "PARSE_WINDOW_SIZE", window_size)
+    vertices, colors, faces = parse(tmp_path, text, newline="\r\n")
+    ref_vertices, ref_colors, ref_faces = reference_parse(text)
+    
+    np.testing.assert_array_equal(vertices, ref_vertices)
+    np.testing.assert_array_equal(colors, ref_colors)
+    np.testing.assert_array_equal(sorted_rows(faces), sorted_rows(ref_faces))
+
+
+def test_convert_writes_usdz_with_mesh_and_extent(tmp_path):
+    from pxr import Usd, UsdGeom
+    
+    obj_path = tmp_path / "chair.obj"
+    obj_path.write_text("v 0 0 0 1 0 0\nv 2 0 0 0 1 0\nv 2 3 1 0 0 1\nf 1 2 3\n")
+    usdz_path = tmp_path / "chair.usdz"
+    
+    assert obj_to_usdz.convert(obj_path, usdz_path)
+    assert not (tmp_path / "chair.usdc").exists()
+    
+    stage = Usd.Stage.Open(str(usdz_path))
+    mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/World/Mesh"))
+    assert len(mesh.GetPointsAttr().Get()) == 3
+    assert list(mesh.GetFaceVertexIndicesAttr().Get()) == [0, 1, 2]
+    assert [tuple(p) for p in mesh.GetExtentAttr().Get()] == [(0, 0, 0), (2, 3, 1)]
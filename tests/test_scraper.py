@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from scraper_final import GoogleImageScraper
+
+TBN = "https://encrypted-tbn0.gstatic.com/images?q=tbn:ANd9GcQexampleThumbnail"
+PNG = "https://cdn.example.com/products/sofa/large-grey-sofa.png"
+JPG = "https://cdn.example.com/products/table/oak-coffee-table.jpg?w=800"
+TRIPLE = "https://cdn.example.com/products/lamp/black-floor-lamp-photo"
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    return GoogleImageScraper(cache_path=tmp_path / "cache.sqlite")
+
+
+def json_images(scraper, page: bytes):
+    return list(scraper._iter_images_from_json(page))
+
+
+def test_thumbnail_in_triple_outranks_earlier_file_url(scraper):
+    page = f'["{PNG}",800,600] ["{TBN}",259,194]'.encode()
+    assert json_images(scraper, page) == [TBN, PNG]
+
+
+def test_priority_is_thumbnail_then_file_then_triple(scraper):
+    page = f'["{TRIPLE}",300,200] "{JPG}" ["{PNG}",1,2] "{TBN}"'.encode()
+    assert json_images(scraper, page) == [TBN, JPG, PNG, TRIPLE]
+
+
+def test_same_kind_keeps_page_order(scraper):
+    page = f'"{JPG}" "{PNG}"'.encode()
+    assert json_images(scraper, page) == [JPG, PNG]
+
+
+def test_json_escapes_are_unescaped(scraper):
+    page = b'"https://cdn.example.com/img/chair.jpg?a\\u003d1\\u0026b\\u003d2"'
+    assert json_images(scraper, page) == ["https://cdn.example.com/img/chair.jpg?a=1&b=2"]
+
+
+@pytest.mark.parametrize("url", [
+    TBN,
+    PNG,
+    JPG,
+    "https://cdn.example.com/catalog/IMAGES/sofa-front-view",
+    "http://cdn.example.com/products/desk/walnut-desk.JPEG",
+    "https://media.example.com/uploads/item/photo-of-armchair",
+])
+def test_image_like_urls_are_valid(scraper, url):
+    assert scraper._is_valid_image_url(url)
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    "https://a.co/x.jpg",  # too short
+    "ftp://cdn.example.com/products/sofa/grey-sofa.jpg",
+    "https://ssl.gstatic.com/gb/images/bar/al-icon.png",
+    "https://www.gstatic.com/images/branding/googlelogo/2x/googlelogo.png",
+    "https://www.google.com/images/branding/product/ico/googleg.png",
+    "https://cdn.example.com/assets/LOGOS/brand-header.jpg",
+    "https://cdn.example.com/assets/site-logo.png",
+    "https://cdn.example.com/assets/cart-Icon.png",
+    "https://cdn.example.com/favicon-32x32.png",
+    "https://cdn.example.com/static/loading.gif?v=image",
+    "https://cdn.example.com/products/placeholder-image.jpg",
+    "https://cdn.example.com/products/sofa/details-page",  # nothing image-like
+])
+def test_ui_and_non_image_urls_are_rejected(scraper, url):
+    assert not scraper._is_valid_image_url(url)
+
+
+def cache_search_page(scraper, term, expires):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = scraper._search_url(term)
+    response.request = requests.Request("GET", response.url).prepare()
+    response.raw = HTTPResponse(body=b"<html></html>", status=200, request_url=response.url)
+    response._content = b"<html></html>"
+    scraper.session.cache.save_response(response, expires=expires)
+
+
+def test_only_unexpired_cache_entries_count_as_fresh(scraper):
+    now = datetime.now(timezone.utc)
+    cache_search_page(scraper, "oak table", now + timedelta(hours=1))
+    cache_search_page(scraper, "red couch", now - timedelta(hours=1))
+    assert scraper._is_fresh_in_cache(scraper._search_url("oak table"))
+    assert not scraper._is_fresh_in_cache(scraper._search_url("red couch"))
+    assert not scraper._is_fresh_in_cache(scraper._search_url("grey lamp"))
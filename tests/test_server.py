@@ -0,0 +1,98 @@
+import importlib
+import io
+import os
+import subprocess
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("httpx")
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    # Keep the server's scans, caches and outputs out of the real BASE_DIR
+    mp = pytest.MonkeyPatch()
+    mp.setenv("FURNISHER_BASE_DIR", str(tmp_path_factory.mktemp("server")))
+    yield importlib.import_module("furniture_ar_server_final")
+    mp.undo()
+
+
+@pytest.fixture
+def client(server, monkeypatch):
+    monkeypatch.setitem(server.app.config, "MAX_CONTENT_LENGTH", 1 << 20)
+    return server.app.test_client()
+
+
+def test_oversized_upload_is_rejected_with_413(client):
+    scan = io.BytesIO(b"\0" * ((1 << 20) + 1))
+    response = client.post(
+        "/generate-design",
+        data={"file": (scan, "room.usdz"), "room_type": "bedroom", "budget": "2000"},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 413
+    assert "1 MB" in response.get_json()["error"]
+
+
+def test_missing_file_is_rejected_with_400(client):
+    response = client.post("/generate-design", data={"budget": "2000"}, content_type="multipart/form-data")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("url, ext", [
+    ("https://cdn.example.com/sofa.png?w=800", "png"),
+    ("https://cdn.example.com/sofa.JPEG", "jpg"),
+    ("https://cdn.example.com/sofa.jpeg?x=1.png", "jpg"),
+    ("https://cdn.example.com/sofa.webp", "webp"),
+    ("https://cdn.example.com/sofa.gif", "jpg"),
+    ("https://cdn.example.com/images?q=tbn:abc", "jpg"),
+])
+def test_image_extension_only_yields_instantmesh_inputs(server, url, ext):
+    assert server.image_extension(url) == ext
+
+
+@pytest.mark.parametrize("budget, bucket", [
+    ("100", "100"),
+    ("200", "200"),
+    ("1249", "1200"),
+    ("1250.75", "1300"),
+    ("5000", "5000"),
+    ("12345", "12000"),
+    ("7", "7"),
+    ("inf", "inf"),
+    ("nan", "nan"),
+    ("cheap", "cheap"),
+])
+def test_budget_bucket_is_relative(server, budget, bucket):
+    assert server._budget_bucket(budget) == bucket
+
+
+def test_run_instantmesh_picks_outputs_by_prefix_not_mtime(server, tmp_path, monkeypatch):
+    output_dir = tmp_path / "meshes"
+    output_dir.mkdir()
+    mine = output_dir / "rabc_0__plan_0_furniture_0.obj"
+    other = output_dir / "rxyz_0__plan_0_furniture_0.obj"
+
+    def fake_run(cmd, **kwargs):
+        for obj in (mine, other):
+            obj.write_text("v 0 0 0\n")
+            # Coarse filesystem timestamps can land before the run started
+            os.utime(obj, (0, 0))
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(server, "INSTANTMESH_OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(server.subprocess, "run", fake_run)
+    assert server.run_instantmesh(tmp_path, prefix="rabc_") == {mine.stem: mine}
+
+
+def test_finished_jobs_are_evicted_after_ttl(server, monkeypatch):
+    monkeypatch.setattr(server, "JOB_STATUS_TTL", 0)
+    server._update_job("old-job", state="failed", error="boom")
+    server._update_job("running-job", state="running", stage="scraping_images")
+    assert "old-job" not in server.JOB_STATUS
+    assert "running-job" in server.JOB_STATUS
+    server._update_job("running-job", state="complete", stage="complete", result={})
+    server._update_job("new-job", state="queued", stage="queued")
+    assert "running-job" not in server.JOB_STATUS
+    assert "new-job" in server.JOB_STATUS